@@ -0,0 +1,231 @@
+"""Offline micro-benchmarks for the filter, parse and dedupe hot paths.
+
+Run from the repository root:
+
+    python -m benchmarks.bench                                  # 1k and 10k jobs
+    python -m benchmarks.bench --sizes 1000,100000,1000000 --only matcher,himalayas_parse
+    python -m benchmarks.bench --output before.json             # save a baseline
+    python -m benchmarks.bench --baseline before.json --check   # compare against it
+
+Each benchmark times one "unit" of work at a time (a job for the matcher
+and Himalayas parser, a 50-card page for the HTML parsers, the whole corpus
+for dedupe) and reports jobs per second, per-unit latency percentiles and,
+in a separate tracemalloc pass, the peak memory allocated while running.
+Results are written as JSON; with --baseline every result is compared with
+the same benchmark and size in the baseline file and throughput drops
+beyond --tolerance are reported as regressions.
+"""
+
+import argparse
+import importlib
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from benchmarks import corpus
+
+
+def _load_config(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def _bench_matcher(size, seed, config):
+    from utils import get_matcher
+
+    matcher = get_matcher(config)
+    return corpus.make_jobs(size, seed), matcher.matches, 1
+
+
+def _bench_job_matches(size, seed, config):
+    from utils import job_matches
+
+    return corpus.make_jobs(size, seed), lambda job: job_matches(job, config), 1
+
+
+def _bench_dedupe(mode):
+    def setup(size, seed, config):
+        from main import dedupe
+
+        config = dict(config, dedupe=dict(config.get("dedupe") or {}, mode=mode))
+        return [corpus.make_jobs(size, seed)], lambda jobs: dedupe(jobs, config), size
+    return setup
+
+
+def _bench_himalayas_parse(size, seed, config):
+    from scrapers.himalayas import _parse_himalayas_job
+
+    return corpus.make_himalayas_items(size, seed), _parse_himalayas_job, 1
+
+
+def _bench_html(module_name, backend, make_pages):
+    def setup(size, seed, config):
+        from scrapers import html_backend
+
+        if backend == "lxml" and html_backend.etree is None:
+            raise ImportError("lxml is not installed")
+        if backend == "bs4":
+            import bs4  # noqa: F401  (skip cleanly when missing)
+        module = importlib.import_module(f"scrapers.{module_name}")
+        if module_name == "remoteco":
+            find = module._find_cards_lxml if backend == "lxml" else module._find_cards_bs4
+            parse = module._parse_remoteco_job_lxml if backend == "lxml" else module._parse_remoteco_job
+        else:
+            find = module._find_listings_lxml if backend == "lxml" else module._find_listings_bs4
+            parse = module._parse_job_listing_lxml if backend == "lxml" else module._parse_job_listing
+        pages = make_pages(size, seed)
+        return pages, lambda page: [parse(card, "https://example.com") for card in find(page)], size / len(pages)
+    return setup
+
+
+# name -> setup(size, seed, config) returning (units, fn, jobs per unit)
+BENCHMARKS = {
+    "matcher": _bench_matcher,
+    "job_matches": _bench_job_matches,
+    "dedupe_exact": _bench_dedupe("exact"),
+    "dedupe_near": _bench_dedupe("near"),
+    "himalayas_parse": _bench_himalayas_parse,
+    "remoteco_lxml": _bench_html("remoteco", "lxml", corpus.make_remoteco_pages),
+    "remoteco_bs4": _bench_html("remoteco", "bs4", corpus.make_remoteco_pages),
+    "weworkremotely_lxml": _bench_html("weworkremotely", "lxml", corpus.make_wwr_pages),
+    "weworkremotely_bs4": _bench_html("weworkremotely", "bs4", corpus.make_wwr_pages),
+}
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(pct / 100 * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def run_benchmark(name, size, seed=0, repeat=3, config=None, measure_memory=True):
+    """Run one benchmark at one size and return its result dict."""
+    units, fn, jobs_per_unit = BENCHMARKS[name](size, seed, config or {})
+
+    for unit in units[:100]:  # warm up caches and lazy imports
+        fn(unit)
+
+    latencies = []
+    clock = time.perf_counter_ns
+    started = clock()
+    for _ in range(repeat):
+        for unit in units:
+            t0 = clock()
+            fn(unit)
+            latencies.append(clock() - t0)
+    elapsed = (clock() - started) / 1e9
+
+    peak_kb = None
+    if measure_memory:
+        tracemalloc.start()
+        try:
+            for unit in units:
+                fn(unit)
+            peak_kb = tracemalloc.get_traced_memory()[1] / 1024
+        finally:
+            tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "name": name,
+        "size": size,
+        "units": len(units),
+        "repeat": repeat,
+        "seconds": round(elapsed, 6),
+        "jobs_per_s": round(len(units) * jobs_per_unit * repeat / elapsed, 1) if elapsed else None,
+        "latency_us": {
+            p: round(_percentile(latencies, q) / 1000, 3)
+            for p, q in (("p50", 50), ("p90", 90), ("p99", 99), ("max", 100))
+        },
+        "peak_memory_kb": round(peak_kb, 1) if peak_kb is not None else None,
+    }
+
+
+def compare(results, baseline):
+    """Return (key, baseline jobs/s, current jobs/s, ratio) for every shared result.
+
+    ratio is current / baseline throughput, so below 1 means slower.
+    """
+    rows = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if not base or not base.get("jobs_per_s") or not result.get("jobs_per_s"):
+            continue
+        rows.append((key, base["jobs_per_s"], result["jobs_per_s"], result["jobs_per_s"] / base["jobs_per_s"]))
+    return rows
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the filter, parse and dedupe hot paths offline.")
+    parser.add_argument("--sizes", default="1000,10000", help="comma-separated corpus sizes in jobs (default: 1000,10000)")
+    parser.add_argument("--only", help=f"comma-separated benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument("--repeat", type=int, default=3, help="timed passes over each corpus (default: 3)")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the synthetic corpora")
+    parser.add_argument("--config", default="config.json", help="config whose filters are benchmarked")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak-memory pass")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--baseline", help="JSON report from an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed throughput drop vs the baseline (default: 0.10)")
+    parser.add_argument("--check", action="store_true", help="exit with status 1 if any benchmark regressed")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = _load_config(args.config)
+    names = args.only.split(",") if args.only else list(BENCHMARKS)
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        print(f"Unknown benchmarks: {', '.join(unknown)}")
+        return 2
+    sizes = [int(s) for s in args.sizes.split(",")]
+
+    results = {}
+    for name in names:
+        for size in sizes:
+            try:
+                result = run_benchmark(name, size, args.seed, args.repeat, config, not args.no_memory)
+            except ImportError as e:
+                print(f"{name}@{size}: skipped ({e})")
+                break
+            results[f"{name}@{size}"] = result
+            lat = result["latency_us"]
+            memory = f", peak {result['peak_memory_kb']:.0f} KB" if result["peak_memory_kb"] is not None else ""
+            print(f"{name}@{size}: {result['jobs_per_s']:,.0f} jobs/s, "
+                  f"p50 {lat['p50']} us, p99 {lat['p99']} us{memory}")
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved benchmark report to {args.output}")
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f).get("results", {})
+    regressed = 0
+    print(f"\nCompared with {args.baseline}:")
+    for key, before, after, ratio in compare(results, baseline):
+        flag = ""
+        if ratio < 1 - args.tolerance:
+            flag = "  REGRESSION"
+            regressed += 1
+        print(f"  {key}: {before:,.0f} -> {after:,.0f} jobs/s ({ratio:.2f}x){flag}")
+    return 1 if regressed and args.check else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""Synthetic, seeded inputs for the benchmarks.
+
+Everything here is generated offline and deterministically from a seed, so
+two runs of the same size see identical data. The mix is loosely modelled
+on real listings: about a third of titles are AI/ML roles, some carry
+exclude words, and a fraction of jobs are cross-board near-duplicates of
+earlier ones (abbreviated titles, "Inc." suffixes, a different source).
+"""
+
+import html
+import random
+
+
+_AI_TERMS = [
+    "Machine Learning", "ML", "AI", "Deep Learning", "NLP", "LLM", "GenAI",
+    "Computer Vision", "Data Science", "Generative AI",
+]
+_OTHER_TERMS = [
+    "Backend", "Frontend", "Platform", "DevOps", "Mobile", "Security",
+    "Product", "Growth", "Payments", "Infrastructure",
+]
+_ROLES = [
+    "Engineer", "Scientist", "Researcher", "Developer", "Analyst",
+    "Architect", "Manager", "Lead", "Designer", "Recruiter",
+]
+_LEVELS = ["Senior", "Staff", "Principal", "Lead", "", "", "Junior", "Intern"]
+_COMPANY_WORDS = [
+    "Acme", "Globex", "Initech", "Umbrella", "Hooli", "Vandelay", "Stark",
+    "Wayne", "Tyrell", "Cyberdyne", "Soylent", "Aperture", "Wonka", "Gringotts",
+]
+_COMPANY_SUFFIXES = ["", " Inc.", " Labs", " GmbH", " AI", ", LLC"]
+_LOCATIONS = [
+    "Remote", "Worldwide", "Anywhere", "Remote - Europe", "Remote - US",
+    "New York, NY", "Berlin, Germany", "Remote - India",
+]
+_TAGS = ["python", "pytorch", "aws", "sql", "react", "kubernetes", "llm", "nlp", "go", "rust"]
+_WORDS = (
+    "we are building models data pipelines production experience team customers "
+    "research deploy scale training inference evaluation platform product remote "
+    "collaborate python systems distributed latency quality impact mission growth"
+).split()
+_SOURCES = ["remoteok", "remotive", "jobicy", "themuse", "greenhouse", "himalayas", "arbeitnow"]
+
+
+def _title(rng):
+    area = rng.choice(_AI_TERMS) if rng.random() < 0.35 else rng.choice(_OTHER_TERMS)
+    return " ".join(w for w in (rng.choice(_LEVELS), area, rng.choice(_ROLES)) if w)
+
+
+def _company(rng):
+    return rng.choice(_COMPANY_WORDS) + str(rng.randrange(500)) + rng.choice(_COMPANY_SUFFIXES)
+
+
+def _description(rng, words=60):
+    return " ".join(rng.choice(_WORDS) for _ in range(words))
+
+
+def _variant(rng, job, i):
+    """A cross-board copy of job, the way another board would list it."""
+    title = job["title"].replace("Senior", "Sr.").replace("Machine Learning", "ML")
+    if rng.random() < 0.5:
+        title += " (Remote)"
+    return dict(
+        job,
+        title=title,
+        company=job["company"].replace(" Inc.", ""),
+        source=rng.choice(_SOURCES),
+        source_id=f"dup-{i}",
+        url=f"https://jobs.example.com/dup/{i}",
+    )
+
+
+def make_jobs(n, seed=0, duplicate_rate=0.2):
+    """Return n standard job dicts, about `duplicate_rate` of them near-duplicates."""
+    rng = random.Random(seed)
+    jobs = []
+    for i in range(n):
+        if jobs and rng.random() < duplicate_rate:
+            jobs.append(_variant(rng, rng.choice(jobs), i))
+            continue
+        jobs.append({
+            "title": _title(rng),
+            "company": _company(rng),
+            "location": rng.choice(_LOCATIONS),
+            "url": f"https://jobs.example.com/{i}",
+            "date_posted": f"2024-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}",
+            "description": _description(rng),
+            "tags": rng.sample(_TAGS, 3),
+            "source": rng.choice(_SOURCES),
+            "source_id": str(i),
+        })
+    return jobs
+
+
+def make_himalayas_items(n, seed=0):
+    """Return n items shaped like the Himalayas API's "jobs" entries."""
+    rng = random.Random(seed)
+    items = []
+    for i in range(n):
+        restricted = rng.random() < 0.6
+        items.append({
+            "title": _title(rng),
+            "companyName": _company(rng),
+            "locationRestrictions": rng.sample(["United States", "Germany", "India", "Canada"], 2) if restricted else [],
+            "description": _description(rng, 150),
+            "excerpt": _description(rng, 20),
+            "categories": rng.sample(_TAGS, 2),
+            "seniority": [rng.choice(["Senior", "Mid-level"])],
+            "employmentType": "Full Time",
+            "applicationLink": f"https://himalayas.app/jobs/{i}",
+            "pubDate": 1700000000 + i,
+            "guid": f"himalayas-{i}",
+        })
+    return items
+
+
+def _page(cards):
+    return (
+        "<!DOCTYPE html><html><head><title>Remote jobs</title>"
+        "<script>var tracking = {};</script><style>.x{}</style></head>"
+        "<body><header><nav><a href='/'>Home</a><a href='/about'>About</a></nav></header>"
+        "<main>" + "".join(cards) + "</main><footer>Footer text</footer></body></html>"
+    )
+
+
+def _card_fields(rng):
+    return (
+        html.escape(_title(rng)),
+        html.escape(_company(rng)),
+        html.escape(rng.choice(_LOCATIONS)),
+        rng.sample(_TAGS, 2),
+    )
+
+
+def make_remoteco_pages(n, seed=0, per_page=50):
+    """Return remote.co-style HTML pages holding n job cards in total."""
+    rng = random.Random(seed)
+    pages = []
+    for start in range(0, n, per_page):
+        cards = []
+        for i in range(start, min(start + per_page, n)):
+            title, company, location, tags = _card_fields(rng)
+            badges = "".join(f'<span class="badge tag">{t}</span>' for t in tags)
+            cards.append(
+                f'<div class="card job-card">'
+                f'<h3><a href="/job-details/{i}">{title}</a></h3>'
+                f'<span class="company">{company}</span>'
+                f'<span class="location">{location}</span>'
+                f'<span class="date">{rng.randrange(1, 30)} days ago</span>'
+                f"{badges}<p>{_description(rng, 25)}</p></div>"
+            )
+        pages.append(_page(cards).encode("utf-8"))
+    return pages
+
+
+def make_wwr_pages(n, seed=0, per_page=50):
+    """Return We Work Remotely-style HTML pages holding n listings in total."""
+    rng = random.Random(seed)
+    pages = []
+    for start in range(0, n, per_page):
+        cards = []
+        for i in range(start, min(start + per_page, n)):
+            title, company, location, tags = _card_fields(rng)
+            badges = "".join(f'<span class="new-listing__badge">{t}</span>' for t in tags)
+            cards.append(
+                f'<li><a class="job-card" href="/remote-jobs/{i}">'
+                f"<h2>{title}</h2>"
+                f'<span class="new-listing__company-name">{company}</span>'
+                f'<span class="new-listing__header__date">{rng.randrange(1, 30)}d</span>'
+                f'<span class="new-listing__company-location">{location}</span>'
+                f"{badges}</a></li>"
+            )
+        pages.append(_page(cards).encode("utf-8"))
+    return pages
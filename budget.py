@@ -0,0 +1,116 @@
+import threading
+import time
+
+import requests
+
+
+class DeadlineExceeded(requests.Timeout):
+    """Raised instead of sending (or finishing) a request after the run's deadline."""
+
+
+class RunBudget:
+    """Run-wide limits that every scraper checks cooperatively.
+
+    `max_results` caps the total number of jobs yielded across all boards and
+    `max_seconds` the run's wall-clock time. Scrapers call claim() before
+    yielding each job and check spent() before each request, so pagination
+    on every board stops as soon as either limit is hit instead of draining
+    each board to max_results_per_board.
+
+    With `is_new` (main.py passes its dedupe check) a job that duplicates
+    one already claimed, e.g. the same posting on another board, is still
+    yielded but not counted: dedupe merges it away, so max_results caps the
+    jobs written, not the copies found.
+
+    `max_seconds` is a hard deadline: the HTTP client clips its timeouts,
+    rate-limit waits and retries to the time left and refuses requests once
+    it has passed, and main.py stops waiting for boards `grace_seconds`
+    after it, writing whatever was collected.
+
+    Configured by "run_budget" in config.json or --max-total/--max-seconds:
+
+        "run_budget": {"max_results": 200, "max_seconds": 120, "grace_seconds": 1}
+    """
+
+    def __init__(self, max_results=None, max_seconds=None, grace_seconds=1.0, is_new=None):
+        self.max_results = max_results
+        self.is_new = is_new
+        self.started = time.monotonic()
+        self.deadline = self.started + max_seconds if max_seconds else None
+        self.grace = grace_seconds
+        self.count = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @classmethod
+    def from_config(cls, config, max_results=None, max_seconds=None, is_new=None):
+        """Build the run's budget, or return None when nothing is limited.
+
+        Explicit arguments (from the command line) override config.json.
+        """
+        settings = (config or {}).get("run_budget") or {}
+        max_results = max_results or settings.get("max_results")
+        max_seconds = max_seconds or settings.get("max_seconds")
+        if not (max_results or max_seconds):
+            return None
+        return cls(max_results, max_seconds, settings.get("grace_seconds", 1.0), is_new)
+
+    def remaining(self):
+        """Seconds left before the deadline (None if there is no deadline)."""
+        if self.deadline is None:
+            return None
+        return max(self.deadline - time.monotonic(), 0.0)
+
+    def wait_seconds(self):
+        """How long main.py waits for boards: the time left plus the grace period."""
+        if self.deadline is None:
+            return None
+        return self.remaining() + self.grace
+
+    def past_deadline(self):
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def exhausted(self):
+        if self.max_results is not None and self.count >= self.max_results:
+            return True
+        return self.past_deadline()
+
+    def claim(self, job=None):
+        """Reserve one job. Returns False once the budget is exhausted."""
+        with self._lock:
+            if self.exhausted():
+                self.note_stop()
+                return False
+            if job is not None and self.max_results is not None and self.is_new and not self.is_new(job):
+                return True  # a duplicate of a claimed job: merged away, so free
+            self.count += 1
+            return True
+
+    def start_board(self):
+        """Begin tracking whether the board scraped on this thread is cut short."""
+        self._local.stopped = False
+
+    def note_stop(self):
+        """Record that the board scraped on this thread stopped because of the budget."""
+        self._local.stopped = True
+
+    def stopped_early(self):
+        """True if the budget stopped this thread's board since start_board()."""
+        return getattr(self._local, "stopped", False)
+
+
+def spent(budget):
+    """True if there is a budget and it is exhausted.
+
+    Scrapers only ask to decide whether to stop, so a True answer is
+    recorded as the current board having been cut short by the budget.
+    """
+    if budget is None or not budget.exhausted():
+        return False
+    budget.note_stop()
+    return True
+
+
+def claim(budget, job=None):
+    """Reserve `job` against the budget, if any. False means stop."""
+    return budget is None or budget.claim(job)
@@ -0,0 +1,169 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from urllib.parse import urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from utils import board_config
+
+
+# Response headers worth keeping. The stored body is already decoded, so
+# Content-Encoding/Content-Length must not be replayed with it.
+_KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Date")
+
+
+def build_response(status, url, headers, body):
+    """Build a requests.Response from stored parts, as if it came off the wire."""
+    resp = requests.Response()
+    resp.status_code = status
+    resp.url = url
+    resp.headers = CaseInsensitiveDict(headers)
+    resp.encoding = requests.utils.get_encoding_from_headers(resp.headers)
+    resp._content = body
+    resp._content_consumed = True
+    return resp
+
+
+def cache_key(url, params=None):
+    """Stable key for a GET request: the URL plus its sorted query params."""
+    if params:
+        url = f"{url}?{urlencode(sorted(params.items()), doseq=True)}"
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+class CachedEntry:
+    def __init__(self, key, meta, body):
+        self.key = key
+        self.meta = meta
+        self.body = body
+
+    def age(self):
+        return time.time() - self.meta["stored_at"]
+
+    def validators(self):
+        """Conditional request headers for revalidating this entry."""
+        headers = {}
+        if self.meta["headers"].get("ETag"):
+            headers["If-None-Match"] = self.meta["headers"]["ETag"]
+        if self.meta["headers"].get("Last-Modified"):
+            headers["If-Modified-Since"] = self.meta["headers"]["Last-Modified"]
+        return headers
+
+    def to_response(self):
+        """Rebuild a requests.Response so scrapers can't tell it was cached."""
+        resp = build_response(self.meta["status"], self.meta["url"], self.meta["headers"], self.body)
+        resp.from_cache = True
+        return resp
+
+
+class ResponseCache:
+    """Persistent on-disk cache for successful GET responses.
+
+    Configured by the "cache" section of config.json:
+
+        "cache": {"enabled": true, "dir": ".cache/http", "ttl": 600, "max_mb": 200}
+
+    `ttl` (seconds) can be overridden per board with boards.<name>.cache_ttl.
+    A fresh entry is served without touching the network; a stale one is
+    revalidated with If-None-Match / If-Modified-Since so an unchanged page
+    costs only a 304. When the directory grows past `max_mb` the least
+    recently used entries are evicted.
+
+    Each entry is a single file: one line of JSON metadata followed by the
+    raw (decoded) body.
+    """
+
+    def __init__(self, config):
+        settings = config.get("cache") or {}
+        self.config = config
+        self.path = settings.get("dir") or os.path.join(".cache", "http")
+        self.ttl = settings.get("ttl", 600)
+        self.max_bytes = int((settings.get("max_mb") or 200) * 1024 * 1024)
+        self._lock = threading.Lock()
+        os.makedirs(self.path, exist_ok=True)
+        self._size = sum(e.stat().st_size for e in os.scandir(self.path) if e.is_file())
+
+    @classmethod
+    def from_config(cls, config):
+        """Return a ResponseCache, or None if caching is not enabled."""
+        settings = (config or {}).get("cache") or {}
+        if not settings.get("enabled"):
+            return None
+        return cls(config)
+
+    def ttl_for(self, board):
+        return board_config(self.config, board).get("cache_ttl", self.ttl)
+
+    def _file(self, key):
+        return os.path.join(self.path, key)
+
+    def get(self, key):
+        """Return the CachedEntry for key, or None."""
+        path = self._file(key)
+        try:
+            with open(path, "rb") as f:
+                meta = json.loads(f.readline())
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        # Bump the mtime: it doubles as the LRU access time
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return CachedEntry(key, meta, body)
+
+    def put(self, key, resp):
+        """Store a 200 response under key."""
+        meta = {
+            "url": resp.url,
+            "status": resp.status_code,
+            "stored_at": time.time(),
+            "headers": {h: resp.headers[h] for h in _KEPT_HEADERS if h in resp.headers},
+        }
+        self._write(key, meta, resp.content)
+
+    def refresh(self, entry, resp):
+        """Mark an entry fresh again after a 304, taking any new validators."""
+        entry.meta["stored_at"] = time.time()
+        for h in ("ETag", "Last-Modified", "Date"):
+            if h in resp.headers:
+                entry.meta["headers"][h] = resp.headers[h]
+        self._write(entry.key, entry.meta, entry.body)
+
+    def _write(self, key, meta, body):
+        path = self._file(key)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(json.dumps(meta).encode("utf-8") + b"\n")
+            f.write(body)
+        with self._lock:
+            try:
+                self._size -= os.path.getsize(path)
+            except OSError:
+                pass
+            os.replace(tmp, path)
+            self._size += os.path.getsize(path)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Drop least recently used entries until back under 90% of the cap."""
+        entries = sorted(
+            (e for e in os.scandir(self.path) if e.is_file() and not e.name.endswith(".tmp")),
+            key=lambda e: e.stat().st_mtime,
+        )
+        target = self.max_bytes * 0.9
+        for e in entries:
+            if self._size <= target:
+                break
+            try:
+                size = e.stat().st_size
+                os.remove(e.path)
+            except OSError:
+                continue
+            self._size -= size
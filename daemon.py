@@ -0,0 +1,119 @@
+import signal
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from metrics import get_metrics
+from near_dupes import NearDuplicateIndex
+from pagination import save_history
+from utils import board_config
+
+
+def board_interval(config, board):
+    """Seconds between polls of a board: boards.<key>.interval, else its registry default."""
+    return board_config(config, board.key).get("interval") or board.interval
+
+
+def clip_cache_ttls(config, boards):
+    """Keep each board's HTTP cache TTL below its polling interval.
+
+    Otherwise a board polled every 5 minutes with a 30 minute cache TTL would
+    be served the same cached listing five polls out of six.
+    """
+    if not (config.get("cache") or {}).get("enabled"):
+        return
+    default_ttl = config["cache"].get("ttl", 600)
+    for board in boards:
+        settings = config.setdefault("boards", {}).setdefault(board.key, {})
+        ttl = settings.get("cache_ttl", default_ttl)
+        settings["cache_ttl"] = min(ttl, board_interval(config, board) / 2)
+
+
+def run_daemon(config, boards, store, writer, scrape, max_polls=None, on_poll=None):
+    """Poll each board on its own interval and write only jobs never seen before.
+
+    Stays resident so the pooled HTTP sessions, compiled matchers, imported
+    scrapers and the near-duplicate index stay warm between polls. Every
+    board is polled once at start-up, then again `interval` seconds after
+    its previous poll started; up to `max_parallel_boards` polls run at
+    once. `scrape(board)` returns a poll's jobs. They are recorded in the
+    job store and only jobs it has never seen, and which don't duplicate a
+    job already seen on another board, are written to `writer`.
+
+    The near-duplicate index is seeded from jobs the store saw in the last
+    daemon.seed_days days, so a restart doesn't re-announce them. Runs until
+    SIGINT/SIGTERM, or until `max_polls` polls have completed.
+    """
+    settings = config.get("daemon") or {}
+    index = NearDuplicateIndex.from_config(config)
+    for job in store.recent_jobs(settings.get("seed_days", 7)):
+        index.add(job)
+
+    stop = threading.Event()
+    _stop_on_signals(stop)
+
+    intervals = {board.key: board_interval(config, board) for board in boards}
+    due = {board.key: 0.0 for board in boards}
+    running = {}
+    polls = 0
+    max_parallel = max(min(config.get("max_parallel_boards") or 1, len(boards)), 1)
+    pool = ThreadPoolExecutor(max_workers=max_parallel)
+    print(f"Daemon polling {', '.join(f'{b.name} every {intervals[b.key]:.0f}s' for b in boards)}")
+    try:
+        while not stop.is_set():
+            now = time.monotonic()
+            busy = set(running.values())
+            for board in boards:  # most expensive first
+                if board not in busy and due[board.key] <= now:
+                    due[board.key] = now + intervals[board.key]
+                    running[pool.submit(scrape, board)] = board
+
+            timeout = min(max(min(due.values()) - time.monotonic(), 0.0), 1.0)
+            if not running:
+                stop.wait(timeout)
+                continue
+            done, _ = wait(list(running), timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                board = running.pop(future)
+                try:
+                    jobs = future.result()
+                except Exception as e:
+                    print(f"{board.name} poll failed: {e}")
+                    jobs = []
+                new = _emit_new(jobs, store, index, writer)
+                print(f"[{time.strftime('%H:%M:%S')}] {board.name}: {new} new jobs")
+                polls += 1
+                if on_poll:
+                    on_poll(board)
+                if max_polls and polls >= max_polls:
+                    stop.set()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print("Daemon stopping...")
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _emit_new(jobs, store, index, writer):
+    run_id = store.start_run()
+    metrics = get_metrics()
+    count = 0
+    for job in store.record(jobs, run_id, new_only=True):
+        _, is_new = index.add(job)
+        if not is_new:
+            continue
+        job = dict(job, sources=[job.get("source")])
+        writer.write(job)
+        metrics.count_out(job)
+        count += 1
+        print(f"  NEW {job.get('title')} @ {job.get('company')} ({job.get('source')}) {job.get('url')}")
+    writer.flush()
+    save_history()
+    return count
+
+
+def _stop_on_signals(stop):
+    """Turn SIGTERM into a clean stop (SIGINT raises KeyboardInterrupt as usual)."""
+    if threading.current_thread() is not threading.main_thread():
+        return
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
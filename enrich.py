@@ -0,0 +1,138 @@
+import importlib
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from http_client import get_client
+from utils import get_matcher
+
+
+# Boards whose listings lack a real description and whose scraper module
+# provides fetch_detail(job, client, config).
+DEFAULT_BOARDS = ["greenhouse", "remoteco", "weworkremotely"]
+
+
+class DetailCache:
+    """Persistent cache of fetched job descriptions, keyed by (source, source_id).
+
+    Postings don't change their description, so entries never expire: each
+    job's detail page is fetched once ever. Failed fetches are not cached.
+    """
+
+    def __init__(self, path):
+        dirname = os.path.dirname(path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS details ("
+            "source TEXT NOT NULL, source_id TEXT NOT NULL, description TEXT, "
+            "fetched_at TEXT NOT NULL, PRIMARY KEY (source, source_id))"
+        )
+        self.conn.commit()
+
+    def get(self, source, source_id):
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT description FROM details WHERE source = ? AND source_id = ?",
+                (source, source_id),
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, source, source_id, description):
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO details VALUES (?, ?, ?, ?)",
+                (source, source_id, description, time.strftime("%Y-%m-%d %H:%M:%S")),
+            )
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+def _detail_fetcher(source):
+    """Return the scraper module's fetch_detail, importing it on first use."""
+    module = importlib.import_module(f"scrapers.{source}")
+    return getattr(module, "fetch_detail", None)
+
+
+def _fetch_description(job, cache, config):
+    source, source_id = job.get("source"), job.get("source_id")
+    cached = cache.get(source, source_id)
+    if cached is not None:
+        return cached
+    fetch_detail = _detail_fetcher(source)
+    if fetch_detail is None:
+        return None
+    try:
+        description = fetch_detail(job, get_client(config), config)
+    except Exception as e:
+        print(f"  Enrich {source} {source_id!r} failed: {e}")
+        return None
+    if description:
+        cache.put(source, source_id, description)
+    return description
+
+
+def enrich_jobs(jobs, config):
+    """Yield jobs with full descriptions fetched from their detail pages.
+
+    Only jobs from the boards listed in config["enrich"]["boards"] are
+    enriched; everything else passes straight through. Jobs arriving here
+    have already passed the title filters, so the extra requests are spent
+    only on real candidates. Detail fetches run on a pool of
+    `concurrency` threads with at most that many jobs in flight, and results
+    come out in input order. Once a job has its full description it is
+    trimmed to the usual 1000 characters and filtered again, so
+    exclude_keywords apply to the real text exactly as on the boards whose
+    listings include a description.
+
+    Settings (config.json):
+
+        "enrich": {"enabled": true, "concurrency": 4,
+                   "boards": ["greenhouse", ...], "cache_path": ".cache/details.db"}
+    """
+    settings = config.get("enrich") or {}
+    boards = set(settings.get("boards") or DEFAULT_BOARDS)
+    window = max(settings.get("concurrency") or 4, 1)
+    matcher = get_matcher(config)
+    cache = DetailCache(settings.get("cache_path") or os.path.join(".cache", "details.db"))
+
+    def finish(job, future):
+        description = future.result() if future else None
+        if not description:
+            return job
+        # Filter on the same first 1000 characters the other boards keep, so
+        # "mentor junior engineers" deep in a long posting doesn't drop it.
+        job = dict(job, description=description[:1000])
+        if not matcher.matches(job):
+            return None
+        return job
+
+    pool = ThreadPoolExecutor(max_workers=window)
+    in_flight = deque()
+    try:
+        for job in jobs:
+            future = None
+            if job.get("source") in boards and job.get("source_id"):
+                future = pool.submit(_fetch_description, job, cache, config)
+            in_flight.append((job, future))
+            if len(in_flight) >= window:
+                done = finish(*in_flight.popleft())
+                if done:
+                    yield done
+        while in_flight:
+            done = finish(*in_flight.popleft())
+            if done:
+                yield done
+    finally:
+        for _, future in in_flight:
+            if future:
+                future.cancel()
+        pool.shutdown(wait=True, cancel_futures=True)
+        cache.close()
@@ -0,0 +1,398 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from budget import DeadlineExceeded
+from cache import ResponseCache, cache_key
+from jsonstream import iter_array
+from metrics import get_metrics
+from ratelimit import RateLimiter
+from replay import Recorder, Replayer
+from resilience import RETRY_STATUSES, CircuitBreaker, RetryPolicy
+
+
+DEFAULT_USER_AGENT = "ai-job-scraper/1.0 (+https://github.com)"
+
+# The HTML boards (remote.co, We Work Remotely) serve stripped-down pages to
+# non-browser agents, so those scrapers send this instead.
+BROWSER_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+)
+
+# Bytes read per step when a JSON body is decoded as it downloads.
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class HttpClient:
+    """Pooled HTTP client shared by every scraper.
+
+    Keeps one requests.Session per host so repeated calls to the same board
+    (Himalayas pages, Greenhouse company boards, RemoteOK tags) reuse a
+    kept-alive connection instead of paying a fresh TCP + TLS handshake each
+    time. Defaults come from the optional "http" section of config.json:
+
+        "http": {"timeout": 15, "pool_size": 10, "user_agent": "..."}
+
+    Every request first waits on its host's adaptive token bucket (see
+    ratelimit.RateLimiter), so scrapers never need to sleep between calls.
+    When the "cache" section is enabled, responses are served from and stored
+    in the on-disk cache.ResponseCache first.
+
+    Failed requests (connection errors, timeouts, 429/5xx) are retried
+    with backoff per resilience.RetryPolicy, and each board has a
+    resilience.CircuitBreaker that stops sending its requests after repeated
+    failures. "hedge_after": seconds sends a duplicate GET when the first is
+    that slow and takes whichever answers first.
+
+    When main.py sets `budget` to a RunBudget with a deadline, timeouts,
+    rate-limit waits and retries are clipped to the time left, and requests
+    (and streamed body reads) raise budget.DeadlineExceeded once it passes.
+
+    "record": path writes every exchange to a replay.Recorder archive;
+    "replay": path serves responses from such an archive and never touches
+    the network, cache or rate limiter ("replay_latency": "recorded" or
+    seconds simulates network time).
+    """
+
+    def __init__(self, config=None):
+        http = (config or {}).get("http") or {}
+        self.timeout = http.get("timeout") or 15
+        self.pool_size = http.get("pool_size") or 10
+        self.user_agent = http.get("user_agent") or DEFAULT_USER_AGENT
+        self.limiter = RateLimiter(config)
+        self.cache = ResponseCache.from_config(config)
+        self.recorder = Recorder(http["record"]) if http.get("record") else None
+        self.replayer = Replayer(http["replay"], http.get("replay_latency")) if http.get("replay") else None
+        self.retry = RetryPolicy.from_config(config)
+        self.hedge_after = http.get("hedge_after")
+        self._hedge_pool = ThreadPoolExecutor(max_workers=self.pool_size) if self.hedge_after else None
+        self._breaker_settings = {
+            "failures": http.get("breaker_failures", 5),
+            "cooldown": http.get("breaker_cooldown", 300.0),
+        }
+        self._breakers = {}
+        self.budget = None
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def session_for(self, url):
+        """Return the pooled session for the URL's host, creating it once."""
+        return self._session_for_host(urlsplit(url).netloc)
+
+    def _session_for_host(self, host):
+        session = self._sessions.get(host)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(host)
+                if session is None:
+                    session = self._new_session()
+                    self._sessions[host] = session
+        return session
+
+    def _new_session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({
+            "User-Agent": self.user_agent,
+            "Accept-Encoding": "gzip, deflate",
+            "Connection": "keep-alive",
+        })
+        return session
+
+    def get(self, url, params=None, headers=None, timeout=None, board=None):
+        """GET a URL through the host's pooled session and rate limiter.
+
+        `headers` are merged over the session defaults, so callers only pass
+        what differs (e.g. a browser User-Agent for HTML boards). `board` picks
+        the per-board rate limit and cache TTL settings from config.json.
+        """
+        if self.replayer:
+            started = time.perf_counter()
+            resp = self.replayer.get(url, params)
+            get_metrics().record_request(board, resp.status_code, len(resp.content), time.perf_counter() - started)
+            return resp
+        started = time.perf_counter()
+        resp = self._fetch(url, params, headers, timeout, board)
+        if self.recorder:
+            self.recorder.record(url, params, resp, time.perf_counter() - started)
+        return resp
+
+    def iter_json(self, url, params=None, headers=None, timeout=None, board=None, path=None):
+        """GET a JSON array and yield its elements while the body downloads.
+
+        `path` is the key holding the array when the body is an object
+        (see jsonstream.iter_array). Elements are decoded chunk by chunk, so
+        a caller that stops early (quota reached) never downloads or holds
+        the rest of the body; closing the generator closes the connection.
+        Error statuses raise requests.HTTPError before anything is yielded.
+
+        A streamed body is cached and recorded only if it was read to the
+        end. When recording, the rest of the body is drained on close; a
+        download that failed part-way (reset, deadline) is neither cached
+        nor recorded. Cached and replayed responses are complete already and
+        are decoded from memory.
+        """
+        started = time.perf_counter()
+        if self.replayer:
+            resp = self.get(url, params, headers, timeout, board)
+        else:
+            resp = self._fetch(url, params, headers, timeout, board, stream=True)
+        streaming = not resp._content_consumed
+        download = _Download(keep=bool(self.cache or self.recorder))
+        try:
+            resp.raise_for_status()
+            body = resp.iter_content(STREAM_CHUNK_SIZE)
+            if streaming:
+                body = _tee(body, download, board, self.budget)
+            yield from iter_array(body, path)
+            if streaming:
+                for _ in body:  # whatever follows the array
+                    pass
+        finally:
+            try:
+                if streaming and not download.complete and self.recorder:
+                    try:
+                        for _ in body:
+                            pass
+                    except requests.RequestException:
+                        pass  # left incomplete: not cached or recorded
+                if streaming and download.complete and download.chunks is not None:
+                    resp._content = b"".join(download.chunks)
+                    resp._content_consumed = True
+                    if self.cache:
+                        self.cache.put(cache_key(url, params), resp)
+                if self.recorder and not self.replayer and resp._content_consumed:
+                    self.recorder.record(url, params, resp, time.perf_counter() - started)
+            finally:
+                resp.close()
+
+    def _fetch(self, url, params, headers, timeout, board, stream=False):
+        entry = None
+        if self.cache:
+            key = cache_key(url, params)
+            entry = self.cache.get(key)
+            if entry and entry.age() < self.cache.ttl_for(board):
+                get_metrics().record_cache_hit(board, len(entry.body))
+                return entry.to_response()
+            if entry:
+                headers = {**entry.validators(), **(headers or {})}
+
+        host = urlsplit(url).netloc
+        bucket = self.limiter.bucket(host, board)
+        breaker = self.breaker(board)
+        metrics = get_metrics()
+        breaker.check()
+        # Every way out of here resolves the request for the breaker, so a
+        # half-open trial can't be left pending and the circuit stuck open.
+        try:
+            attempt = 0
+            while True:
+                waited = bucket.acquire(max_wait=self._time_left())
+                if waited is None:
+                    raise self._deadline(f"{board or host}: run deadline reached waiting on the rate limiter")
+                left = self._time_left()
+                request_timeout = min(timeout or self.timeout, left) if left is not None else timeout or self.timeout
+                started = time.perf_counter()
+                try:
+                    resp = self._send(host, bucket, board, url, params, headers, request_timeout, stream)
+                    # Only a 200 body is worth streaming; error pages are read now.
+                    streamed = stream and resp.status_code == 200
+                    nbytes = 0 if streamed else len(resp.content)
+                except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                    metrics.record_request(board, None, 0, time.perf_counter() - started, waited, error=True)
+                    if isinstance(e, requests.Timeout) and self.budget and self.budget.past_deadline():
+                        # The timeout was cut down to the time left: the deadline, not the host, ended it.
+                        raise self._deadline(f"{board or host}: run deadline reached waiting for a response") from e
+                    delay = self._retry_delay(attempt)
+                    if delay is None:
+                        raise
+                except requests.RequestException:
+                    metrics.record_request(board, None, 0, time.perf_counter() - started, waited, error=True)
+                    raise
+                else:
+                    metrics.record_request(board, resp.status_code, nbytes, time.perf_counter() - started, waited)
+                    retry_after = resp.headers.get("Retry-After")
+                    bucket.on_response(resp.status_code, retry_after)
+                    if resp.status_code not in RETRY_STATUSES:
+                        breaker.success()
+                        break
+                    delay = self._retry_delay(attempt, retry_after)
+                    if delay is None:
+                        blocked = self.retry.too_long(retry_after)
+                        if blocked:
+                            breaker.trip(blocked)  # rather than block the host's bucket that long
+                        else:
+                            breaker.failure()
+                        break
+                    resp.close()
+                # Retry-After itself is waited out by the bucket on the next acquire().
+                metrics.record_retry(board)
+                time.sleep(delay)
+                attempt += 1
+        except DeadlineExceeded:
+            breaker.abandon()  # our own cut-off, not the host failing
+            raise
+        except Exception:
+            breaker.failure()
+            raise
+
+        if self.cache:
+            if resp.status_code == 304 and entry:
+                self.cache.refresh(entry, resp)
+                return entry.to_response()
+            if resp.status_code == 200 and not streamed:
+                self.cache.put(key, resp)
+        return resp
+
+    def _time_left(self):
+        """Seconds until the run's deadline (None if there is none); raises once it has passed."""
+        left = self.budget.remaining() if self.budget else None
+        if left is not None and left <= 0:
+            raise self._deadline("run deadline reached")
+        return left
+
+    def _deadline(self, message):
+        """A DeadlineExceeded to raise, noting that this thread's board was cut short."""
+        self.budget.note_stop()
+        return DeadlineExceeded(message)
+
+    def _retry_delay(self, attempt, retry_after=None):
+        """The policy's backoff before a retry, or None if it wouldn't end before the deadline."""
+        delay = self.retry.delay(attempt, retry_after)
+        left = self.budget.remaining() if self.budget else None
+        if delay is not None and left is not None and delay >= left:
+            return None
+        return delay
+
+    def breaker(self, board):
+        """Return the board's CircuitBreaker, creating it once."""
+        key = board or "other"
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(key, CircuitBreaker(key, **self._breaker_settings))
+        return breaker
+
+    def _send(self, host, bucket, board, url, params, headers, timeout, stream):
+        """Send one GET; with "hedge_after", race a duplicate against a slow one.
+
+        When the first request hasn't answered after hedge_after seconds, a
+        second identical request (paced by the same token bucket) is sent and
+        whichever answers first wins; the loser's response is closed once it
+        arrives. No hedge is sent if the bucket can't release one before the
+        first request times out. Only safe because every request here is an
+        idempotent GET.
+        """
+        session = self._session_for_host(host)
+
+        def send():
+            return session.get(url, params=params, headers=headers, timeout=timeout, stream=stream)
+
+        if not self._hedge_pool:
+            return send()
+        primary = self._hedge_pool.submit(send)
+        done, _ = wait([primary], timeout=self.hedge_after)
+        if done:
+            return primary.result()
+        # `timeout` is already clipped to the run's time left, so this bounds
+        # the wait by the deadline as well as by when the primary gives up.
+        # A hedge that can't be sent before then is no use: wait on the primary.
+        max_wait = timeout - self.hedge_after
+        if max_wait <= 0 or bucket.acquire(max_wait=max_wait) is None:
+            return primary.result()
+        get_metrics().record_hedge(board)
+        futures = [primary, self._hedge_pool.submit(send)]
+        error = None
+        for future in as_completed(futures):
+            try:
+                resp = future.result()
+            except requests.RequestException as e:
+                error = e
+                continue
+            for other in futures:
+                if other is not future:
+                    other.add_done_callback(_close_response)
+            return resp
+        raise error
+
+    def close(self):
+        if self._hedge_pool:
+            self._hedge_pool.shutdown(wait=False, cancel_futures=True)
+        if self.recorder:
+            self.recorder.close()
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+def _close_response(future):
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+class _Download:
+    """The chunks of a streamed body read so far; `complete` once it ended cleanly.
+
+    Chunks are only kept (`keep`) when the body may be cached or recorded;
+    otherwise `chunks` is None and only about one chunk is ever held.
+    """
+
+    def __init__(self, keep=True):
+        self.chunks = [] if keep else None
+        self.complete = False
+
+
+def _tee(chunks, download, board, budget=None):
+    """Pass chunks through, keeping them in `download` and counting them in the metrics.
+
+    download.complete is only set when the body ran out, never when reading
+    it raised. Stops the download with DeadlineExceeded once the run's
+    deadline passes.
+    """
+    metrics = get_metrics()
+    iterator = iter(chunks)
+    while True:
+        if budget and budget.past_deadline():
+            budget.note_stop()
+            raise DeadlineExceeded(f"{board}: run deadline reached mid-download")
+        started = time.perf_counter()
+        try:
+            chunk = next(iterator)
+        except StopIteration:
+            download.complete = True
+            return
+        if download.chunks is not None:
+            download.chunks.append(chunk)
+        metrics.record_bytes(board, len(chunk), time.perf_counter() - started)
+        yield chunk
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client(config=None):
+    """Return the process-wide HttpClient, creating it from config on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient(config)
+    return _client
+
+
+def close_client():
+    """Close all pooled connections; the next get_client() starts fresh."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
@@ -0,0 +1,105 @@
+import codecs
+import json
+
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+_AFTER_VALUE = _WHITESPACE + ",]}:"
+
+
+class _Reader:
+    """A text buffer over a byte-chunk iterator, filled only as far as parsing needs."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._text = codecs.getincrementaldecoder("utf-8-sig")()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        """Append the next chunk to the buffer. Returns False at end of input."""
+        if self.eof:
+            return False
+        for chunk in self._chunks:
+            text = self._text.decode(chunk)
+            if text:
+                # Drop what's already been parsed so the buffer stays ~one chunk.
+                self.buf = self.buf[self.pos:] + text
+                self.pos = 0
+                return True
+        self._text.decode(b"", final=True)  # raises on a truncated UTF-8 sequence
+        self.eof = True
+        return False
+
+    def peek(self):
+        """Skip whitespace and return the next character, or "" at end of input."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, chars):
+        """Consume the next non-whitespace character, which must be one of chars."""
+        ch = self.peek()
+        if not ch or ch not in chars:
+            raise ValueError(f"Expected one of {chars!r} in JSON stream, got {ch or 'end of input'!r}")
+        self.pos += 1
+        return ch
+
+    def value(self):
+        """Decode the next complete JSON value, reading more input until it is whole."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # A number cut at a chunk boundary ("1" of "1.5") decodes early:
+            # only accept a value followed by what may follow a value.
+            if (end == len(self.buf) or self.buf[end] not in _AFTER_VALUE) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_array(chunks, path=None):
+    """Yield the elements of a JSON array as they arrive, from an iterable of byte chunks.
+
+    The array is the whole document, or with `path` the value of that key
+    in a top-level object (e.g. "jobs" for {"job-count": 3, "jobs": [...]};
+    yields nothing if the key is missing). Each element is decoded as soon
+    as its last byte has been read, so only about one chunk plus one
+    element is held in memory, and a caller that stops iterating early
+    never reads the rest of the input. Malformed input raises ValueError.
+    """
+    reader = _Reader(chunks)
+    if path is not None and not _seek_key(reader, path):
+        return
+    reader.expect("[")
+    if reader.peek() == "]":
+        return
+    while True:
+        yield reader.value()
+        if reader.expect(",]") == "]":
+            return
+
+
+def _seek_key(reader, path):
+    """Advance to the value of key `path` in the top-level object. False if absent."""
+    reader.expect("{")
+    if reader.peek() == "}":
+        return False
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if key == path:
+            return True
+        reader.value()  # skip: the keys before the array are small
+        if reader.expect(",}") == "}":
+            return False
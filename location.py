@@ -0,0 +1,169 @@
+"""Classify job location strings as worldwide, region-restricted or onsite.
+
+All scrapers share this one classifier, so "Remote - US" means the same on
+every board. The known places (US states and cities, countries, regions)
+are compiled into a single regex whose alternation is laid out as a
+prefix trie ("new (?:hampshire|jersey|mexico|york)" rather than four
+separate branches), so a location string is scanned once however many
+places are known. Location strings repeat heavily across jobs ("Remote",
+"Worldwide", "San Francisco, CA"), so verdicts are memoized per string.
+"""
+
+import functools
+import re
+
+
+WORLDWIDE = "worldwide"
+REGION_RESTRICTED = "region-restricted"
+ONSITE = "onsite"
+UNKNOWN = "unknown"
+
+_REMOTE_MARKERS = [
+    "remote", "worldwide", "anywhere", "distributed", "global", "flexible",
+    "work from home", "wfh",
+]
+
+_US_STATES = [
+    "alabama", "alaska", "arizona", "arkansas", "california", "colorado",
+    "connecticut", "delaware", "florida", "georgia", "hawaii", "idaho",
+    "illinois", "indiana", "iowa", "kansas", "kentucky", "louisiana",
+    "maine", "maryland", "massachusetts", "michigan", "minnesota",
+    "mississippi", "missouri", "montana", "nebraska", "nevada",
+    "new hampshire", "new jersey", "new mexico", "new york", "north carolina",
+    "north dakota", "ohio", "oklahoma", "oregon", "pennsylvania",
+    "rhode island", "south carolina", "south dakota", "tennessee", "texas",
+    "utah", "vermont", "virginia", "washington", "west virginia",
+    "wisconsin", "wyoming", "washington d.c.", "washington, d.c.",
+]
+_US_CITIES = [
+    "san francisco", "new york", "nyc", "seattle", "austin", "boston", "chicago",
+    "los angeles", "san jose", "san diego", "palo alto", "mountain view",
+    "menlo park", "sunnyvale", "denver", "atlanta", "miami", "dallas",
+    "houston", "portland", "pittsburgh", "philadelphia", "bay area",
+]
+_US_NAMES = ["us", "u.s.", "usa", "u.s.a.", "united states", "us only", "us-based"]
+
+_COUNTRIES = [
+    "argentina", "australia", "austria", "bangladesh", "belgium", "brazil",
+    "bulgaria", "canada", "chile", "china", "colombia", "costa rica", "croatia",
+    "czech republic", "czechia", "denmark", "egypt", "estonia", "finland",
+    "france", "germany", "greece", "hong kong", "hungary", "india", "indonesia",
+    "ireland", "israel", "italy", "japan", "kenya", "latvia", "lithuania",
+    "malaysia", "mexico", "netherlands", "new zealand", "nigeria", "norway",
+    "pakistan", "peru", "philippines", "poland", "portugal", "romania",
+    "serbia", "singapore", "south africa", "south korea", "spain", "sweden",
+    "switzerland", "taiwan", "thailand", "turkey", "ukraine", "united arab emirates",
+    "uae", "united kingdom", "uk", "england", "scotland", "uruguay", "vietnam",
+]
+_CITIES = {
+    "london": "united kingdom", "berlin": "germany", "munich": "germany",
+    "paris": "france", "amsterdam": "netherlands", "dublin": "ireland",
+    "toronto": "canada", "vancouver": "canada", "montreal": "canada",
+    "bangalore": "india", "bengaluru": "india", "hyderabad": "india",
+    "pune": "india", "mumbai": "india", "delhi": "india", "tel aviv": "israel",
+    "tokyo": "japan", "sydney": "australia", "melbourne": "australia",
+    "zurich": "switzerland", "stockholm": "sweden", "warsaw": "poland",
+    "lisbon": "portugal", "madrid": "spain", "barcelona": "spain",
+}
+_COUNTRY_ALIASES = {"uk": "united kingdom", "england": "united kingdom", "scotland": "united kingdom",
+                    "czechia": "czech republic", "uae": "united arab emirates"}
+_REGIONS = [
+    "europe", "eu", "european union", "emea", "apac", "asia", "asia pacific",
+    "latam", "latin america", "americas", "north america", "south america",
+    "africa", "middle east", "oceania", "cet", "est", "pst", "nordics",
+]
+
+
+def _places():
+    """Map every known place name to the country (or region) it restricts a job to."""
+    places = {}
+    for name in _US_STATES + _US_CITIES + _US_NAMES:
+        places[name] = "united states"
+    for name in _COUNTRIES:
+        places[name] = _COUNTRY_ALIASES.get(name, name)
+    places.update(_CITIES)
+    for name in _REGIONS:
+        places[name] = name
+    return places
+
+
+_PLACES = _places()
+
+
+def trie_pattern(words):
+    """Build a regex alternation matching exactly `words`, factored as a prefix trie.
+
+    Shared prefixes are matched once, so the regex engine never re-reads
+    the start of a word to try the next alternative.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}  # end of word
+
+    def emit(node):
+        branches = []
+        optional = "" in node
+        for ch in sorted(k for k in node if k):
+            branches.append(re.escape(ch) + emit(node[ch]))
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if optional:
+            return "(?:" + body + ")?"
+        return body
+
+    return emit(trie)
+
+
+def _word_regex(words):
+    # Lookarounds instead of \b so names ending in "." ("u.s.") still match.
+    return re.compile(r"(?<![a-z0-9])(?:" + trie_pattern(words) + r")(?![a-z0-9])")
+
+
+_PLACE_RE = _word_regex(_PLACES)
+_REMOTE_RE = _word_regex(_REMOTE_MARKERS)
+
+
+class LocationVerdict:
+    """The classification of one location string.
+
+    `kind` is WORLDWIDE (remote, no place named), REGION_RESTRICTED (remote
+    but limited to `places`), ONSITE (places but no remote marker) or UNKNOWN
+    (empty or unrecognised). `countries` holds the countries/regions those
+    places belong to, e.g. {"united states"} for "Remote - California".
+    """
+
+    __slots__ = ("kind", "remote", "places", "countries")
+
+    def __init__(self, kind, remote, places, countries):
+        self.kind = kind
+        self.remote = remote
+        self.places = places
+        self.countries = countries
+
+    @property
+    def worldwide(self):
+        return self.kind == WORLDWIDE
+
+    def __repr__(self):
+        return f"LocationVerdict({self.kind!r}, places={self.places!r})"
+
+
+@functools.lru_cache(maxsize=8192)
+def classify_location(location):
+    """Classify a location string. Memoized: repeated strings cost a dict lookup."""
+    text = (location or "").lower().strip()
+    if not text:
+        return LocationVerdict(UNKNOWN, False, (), frozenset())
+    remote = _REMOTE_RE.search(text) is not None
+    places = tuple(dict.fromkeys(m.group(0) for m in _PLACE_RE.finditer(text)))
+    countries = frozenset(_PLACES[p] for p in places)
+    if remote:
+        kind = REGION_RESTRICTED if places else WORLDWIDE
+    else:
+        kind = ONSITE if places else UNKNOWN
+    return LocationVerdict(kind, remote, places, countries)
+
@@ -1,82 +1,624 @@
-import json
 import time
+
+_STARTED = time.perf_counter()
+
+import argparse
+import csv
+import importlib
+import json
+import queue
+import threading
 import os
-from scrapers.remoteok import fetch_remoteok
-from scrapers.jobicy import fetch_jobicy
-from scrapers.themuse import fetch_themuse
-from scrapers.greenhouse import fetch_greenhouse
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, wait
+from budget import DeadlineExceeded, RunBudget
+from http_client import close_client, get_client
+from metrics import get_metrics, track_board
+from pagination import save_history
+from scrapers import BOARDS, select_boards
+from store import JobStore
+
+
+# Columns of the output CSV, in the order scrapers build their job dicts.
+OUTPUT_COLUMNS = [
+    "title", "company", "location", "url", "date_posted",
+    "description", "tags", "source", "source_id", "sources",
+]
+
+
+def _dedupe_key(job):
+    return (job.get("company", "").lower(), job.get("title", "").lower())
 
 
-def dedupe(jobs):
+def _near_dedupe(config):
+    return ((config or {}).get("dedupe") or {}).get("mode", "near") == "near"
+
+
+def new_job_check(config=None):
+    """Return is_new(job): True unless job duplicates one it was given before.
+
+    Uses the same rules as iter_dedupe(), so the run budget can count jobs
+    the way they will be written.
+    """
+    if _near_dedupe(config):
+        from near_dupes import NearDuplicateIndex
+
+        index = NearDuplicateIndex.from_config(config)
+        return lambda job: index.add(job)[1]
+
     seen = set()
-    out = []
-    for j in jobs:
-        key = (j.get("company", "").lower(), j.get("title", "").lower())
+
+    def is_new(job):
+        key = _dedupe_key(job)
         if key in seen:
-            continue
+            return False
         seen.add(key)
-        out.append(j)
-    return out
+        return True
 
+    return is_new
 
-def save_csv(jobs):
-    df = pd.DataFrame(jobs)
+
+def iter_dedupe(jobs, config=None):
+    """Yield jobs, skipping any already yielded.
+
+    In the default "near" mode (see near_dupes.py) a job is skipped when it
+    is a near-duplicate of an earlier one, e.g. the same posting cross-listed
+    with "Sr." vs "Senior" or an "Inc." suffix; the first copy to arrive
+    wins. With "dedupe": {"mode": "exact"} only identical (company, title)
+    pairs are dropped. Only keys and small signatures are remembered, so
+    memory grows with unique jobs, not with the size of each job.
+    """
+    is_new = new_job_check(config)
+    near = _near_dedupe(config)
+    for j in jobs:
+        if is_new(j):
+            yield dict(j, sources=[j.get("source")]) if near else j
+
+
+def dedupe(jobs, config=None):
+    """Drop duplicate jobs; in "near" mode, merge them across boards.
+
+    Unlike iter_dedupe(), the batch path sees every copy before choosing, so
+    it keeps the best-sourced record and lists every board it appeared on.
+    """
+    if _near_dedupe(config):
+        from near_dupes import merge_near_duplicates
+
+        return merge_near_duplicates(jobs, config)
+    return list(iter_dedupe(jobs, config))
+
+
+def _output_path(ext="csv"):
     ts = time.strftime("%Y-%m-%d_%H-%M-%S")
     outdir = "outputs"
     os.makedirs(outdir, exist_ok=True)
-    filename = f"ai_jobs_{ts}.csv"
-    path = os.path.join(outdir, filename)
-    df.to_csv(path, index=False)
-    return path
+    filename = f"ai_jobs_{ts}.{ext}" if ext else f"ai_jobs_{ts}"
+    return os.path.join(outdir, filename)
 
 
-def main():
-    with open("config.json") as f:
-        config = json.load(f)
+def save_csv(jobs, engine="csv"):
+    """Write jobs to a new timestamped CSV in outputs/ and return its path.
 
-    all_jobs = []
+    The default engine is the standard csv module. engine="pandas" goes
+    through DataFrame.to_csv instead; pandas is only imported in that case
+    since it alone costs more to import than a small run takes.
+    """
+    if engine == "pandas":
+        import pandas as pd
+
+        path = _output_path()
+        pd.DataFrame(jobs).to_csv(path, index=False)
+        return path
 
-    print("Fetching RemoteOK...")
+    writer = CsvStreamWriter(flush=False)
     try:
-        r_jobs = fetch_remoteok(config)
-        print(f"RemoteOK: found {len(r_jobs)} jobs (pre-dedup)")
-        all_jobs.extend(r_jobs)
-    except Exception as e:
-        print("RemoteOK fetch failed:", e)
+        for job in jobs:
+            writer.write(job)
+    finally:
+        writer.close()
+    return writer.path
+
 
-    print("Fetching Jobicy...")
+class CsvStreamWriter:
+    """Write jobs to the output CSV one row at a time as they arrive.
+
+    Each row is flushed immediately (unless flush=False), so results are on
+    disk seconds into a run and nothing is held in memory. Tags are written
+    the way pandas.DataFrame.to_csv writes a list, so both engines of
+    save_csv() produce the same file.
+    """
+
+    def __init__(self, path=None, flush=True):
+        self.path = path or _output_path()
+        self.count = 0
+        self.flush_each_row = flush
+        self._file = open(self.path, "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._file, fieldnames=OUTPUT_COLUMNS, extrasaction="ignore")
+        self._writer.writeheader()
+
+    def write(self, job):
+        row = dict(job)
+        row["tags"] = str(list(job.get("tags") or []))
+        row["sources"] = ",".join(s for s in (job.get("sources") or []) if s)
+        self._writer.writerow(row)
+        if self.flush_each_row:
+            self._file.flush()
+        self.count += 1
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+# Seconds spent importing each lazily loaded module, for --timing.
+_import_times = {}
+
+
+def _load(target):
+    """Import a "module:function" target and return the function."""
+    module_name, func_name = target.split(":")
+    started = time.perf_counter()
+    module = importlib.import_module(module_name)
+    _import_times.setdefault(module_name, time.perf_counter() - started)
+    return getattr(module, func_name)
+
+
+def _iter_board(board, config, budget=None):
+    """Yield a single board's jobs, turning any failure into an early stop.
+
+    Each board is isolated so an exception in one never affects the others;
+    jobs yielded before the failure are kept. `budget` (a RunBudget) is
+    handed to the scraper, which stops early once it is exhausted. How the
+    board's run ended is recorded with metrics.finish_board().
+    """
+    print(f"Fetching {board.name}...")
+    count = 0
+    status, detail = "partial", "stopped by the consumer"
+    if budget is not None:
+        budget.start_board()
     try:
-        jcy_jobs = fetch_jobicy(config)
-        print(f"Jobicy: found {len(jcy_jobs)} jobs (pre-dedup)")
-        all_jobs.extend(jcy_jobs)
+        for job in track_board(board.key, _load(board.target)(config, budget)):
+            count += 1
+            yield job
+        if budget is not None and budget.stopped_early():
+            status, detail = "partial", "deadline reached" if budget.past_deadline() else "result budget reached"
+        else:
+            status, detail = "complete", None
     except Exception as e:
-        print("Jobicy fetch failed:", e)
+        print(f"{board.name} fetch failed:", e)
+        status = "partial" if isinstance(e, DeadlineExceeded) else "failed"
+        detail = str(e)
+        return
+    finally:
+        get_metrics().finish_board(board.key, status, detail)
+    print(f"{board.name}: found {count} jobs (pre-dedup)")
+
+
+def _run_board(board, config, budget=None, jobs=None):
+    """Collect a board's jobs into `jobs` (a new list by default) and return it.
+
+    Jobs are appended as they arrive, so a caller that stops waiting at the
+    deadline still has everything found so far.
+    """
+    jobs = [] if jobs is None else jobs
+    for job in _iter_board(board, config, budget):
+        jobs.append(job)
+    return jobs
+
+
+def fetch_all(config, budget=None, boards=None):
+    """Fetch the selected boards and return the combined (pre-dedup) job list.
+
+    `boards` defaults to scrapers.select_boards(config). Boards run
+    concurrently on a thread pool of up to `max_parallel_boards` workers,
+    started most expensive first; the work is almost entirely network I/O,
+    so total wall time is roughly that of the slowest board. Setting it to 1
+    runs them one after another. Results are always merged in registry
+    order so dedupe() keeps the same record regardless of which board
+    finishes first.
+
+    With a deadline in `budget`, boards still running its grace period after
+    it are abandoned (marked "timed_out") and the jobs they found so far
+    are returned with the rest.
+    """
+    if boards is None:
+        boards = select_boards(config)
+    max_parallel = config.get("max_parallel_boards") or 1
+
+    if max_parallel <= 1 or len(boards) <= 1:
+        results = {board.key: _run_board(board, config, budget) for board in boards}
+    else:
+        results = {board.key: [] for board in boards}
+        pool = ThreadPoolExecutor(max_workers=min(max_parallel, len(boards)))
+        futures = {
+            pool.submit(_run_board, board, config, budget, results[board.key]): board for board in boards
+        }
+        _, late = wait(futures, timeout=budget.wait_seconds() if budget else None)
+        for future in late:
+            _abandon(futures[future], len(results[futures[future].key]))
+        pool.shutdown(wait=not late, cancel_futures=True)
+
+    all_jobs = []
+    for board in BOARDS:
+        all_jobs.extend(results.get(board.key, ()))
+    return all_jobs
+
+
+def _abandon(board, found):
+    print(f"{board.name}: still running at the deadline, keeping the {found} jobs found so far")
+    get_metrics().finish_board(board.key, "timed_out", "still running at the deadline")
+
+
+class _Done:
+    """Queued by a board's worker when it has no more jobs."""
+
+    def __init__(self, board):
+        self.board = board
+
+
+def _put(out, item, stop):
+    """Put item on the queue, giving up if the consumer has stopped."""
+    while not stop.is_set():
+        try:
+            out.put(item, timeout=0.5)
+            return True
+        except queue.Full:
+            continue
+    return False
+
 
-    print("Fetching The Muse...")
+def _drain_board(board, config, out, stop, budget=None):
     try:
-        muse_jobs = fetch_themuse(config)
-        print(f"The Muse: found {len(muse_jobs)} jobs (pre-dedup)")
-        all_jobs.extend(muse_jobs)
-    except Exception as e:
-        print("The Muse fetch failed:", e)
+        for job in _iter_board(board, config, budget):
+            if not _put(out, job, stop):
+                return
+    finally:
+        _put(out, _Done(board), stop)
+
+
+def stream_all(config, budget=None, boards=None):
+    """Yield jobs from every board as soon as they are scraped.
+
+    The streaming counterpart of fetch_all(): boards run on the same thread
+    pool but hand jobs over through a bounded queue (`stream_buffer` items),
+    so a slow consumer applies back-pressure instead of jobs piling up in
+    memory. Jobs from different boards interleave in arrival order. As in
+    fetch_all(), boards still running after the deadline's grace period are
+    abandoned.
+    """
+    if boards is None:
+        boards = select_boards(config)
+    max_parallel = config.get("max_parallel_boards") or 1
 
-    print("Fetching Greenhouse...")
+    if max_parallel <= 1 or len(boards) <= 1:
+        for board in boards:
+            yield from _iter_board(board, config, budget)
+        return
+
+    out = queue.Queue(maxsize=config.get("stream_buffer") or 100)
+    stop = threading.Event()
+    pool = ThreadPoolExecutor(max_workers=min(max_parallel, len(boards)))
+    for board in boards:
+        pool.submit(_drain_board, board, config, out, stop, budget)
     try:
-        gh_jobs = fetch_greenhouse(config)
-        print(f"Greenhouse: found {len(gh_jobs)} jobs (pre-dedup)")
-        all_jobs.extend(gh_jobs)
-    except Exception as e:
-        print("Greenhouse fetch failed:", e)
+        running = {board.key: board for board in boards}
+        while running:
+            try:
+                item = out.get(timeout=budget.wait_seconds() if budget else None)
+            except queue.Empty:
+                for board in running.values():
+                    _abandon(board, get_metrics().board(board.key).jobs_in)
+                return
+            if isinstance(item, _Done):
+                running.pop(item.board.key, None)
+                continue
+            yield item
+    finally:
+        stop.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+
 
-    all_jobs = dedupe(all_jobs)
+def _output_format(config, args):
+    return args.format or config.get("output_format") or "csv"
+
+
+def _maybe_enrich(jobs, config):
+    """Pass jobs through the detail-page enrichment stage if it is enabled."""
+    if not (config.get("enrich") or {}).get("enabled"):
+        return jobs
+    from enrich import enrich_jobs
+
+    return enrich_jobs(jobs, config)
+
+
+def run_batch(config, args, store, run_id, budget=None, boards=None):
+    fetched = list(_maybe_enrich(fetch_all(config, budget, boards), config))
+
+    if store:
+        new_count = store.upsert(fetched, run_id)
+        print(f"Job store: {new_count} new jobs since last run")
+        if args.new_only:
+            fetched = store.new_jobs(run_id)
+
+    all_jobs = dedupe(fetched, config)
+    metrics = get_metrics()
+    for job in all_jobs:
+        metrics.count_out(job)
 
     if not all_jobs:
         print("No jobs found. Try relaxing your filters in `config.json`.")
-        return
+        return None
 
-    path = save_csv(all_jobs)
+    if _output_format(config, args) == "parquet":
+        from parquet_output import save_parquet
+
+        path = save_parquet(all_jobs)
+    else:
+        path = save_csv(all_jobs, engine=config.get("csv_engine") or "csv")
     print(f"Saved {len(all_jobs)} jobs to {path}")
+    return path
+
+
+def run_streaming(config, args, store, run_id, budget=None, boards=None):
+    """Scrape, filter, dedupe and write jobs one at a time as they arrive."""
+    jobs = _maybe_enrich(stream_all(config, budget, boards), config)
+    if store:
+        jobs = store.record(jobs, run_id, new_only=args.new_only)
+
+    writer = _new_writer(config, args)
+    print(f"Streaming jobs to {writer.path}")
+    metrics = get_metrics()
+    try:
+        for job in iter_dedupe(jobs, config):
+            writer.write(job)
+            metrics.count_out(job)
+    finally:
+        writer.close()
+        jobs.close()
+
+    if not writer.count:
+        os.remove(writer.path)
+        print("No jobs found. Try relaxing your filters in `config.json`.")
+        return None
+    print(f"Saved {writer.count} jobs to {writer.path}")
+    return writer.path
+
+
+def report_boards(boards, budget=None, path=None):
+    """Print the boards whose scrape didn't complete.
+
+    With a run budget (when results may be partial) the per-board status is
+    also written next to the output as _<name>.status.json, or as
+    outputs/_ai_jobs_<time>.status.json when no jobs were written. The leading
+    underscore makes pyarrow/pandas skip it when the output is a file in the
+    Parquet dataset.
+    """
+    metrics = get_metrics()
+    statuses = {}
+    for board in boards:
+        b = metrics.board(board.key)
+        status = b.status or "not_started"
+        statuses[board.key] = {"status": status, "detail": b.status_detail, "jobs_found": b.jobs_in}
+        if status != "complete":
+            print(f"{board.name}: {status}" + (f" ({b.status_detail})" if b.status_detail else ""))
+    if budget:
+        report = {
+            "complete": all(s["status"] == "complete" for s in statuses.values()),
+            "deadline_reached": budget.past_deadline(),
+            "jobs_claimed": budget.count,
+            "boards": statuses,
+        }
+        path = path or _output_path(None)  # no jobs: the status is all there is to report
+        status_path = os.path.join(os.path.dirname(path), f"_{os.path.basename(path)}.status.json")
+        with open(status_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+def _new_writer(config, args, file_per_flush=False):
+    if _output_format(config, args) == "parquet":
+        from parquet_output import ParquetJobWriter
+
+        return ParquetJobWriter(file_per_flush=file_per_flush)
+    return CsvStreamWriter()
+
+
+def run_daemon_mode(config, args, store, boards):
+    """Stay resident, polling each board on its interval (see daemon.run_daemon)."""
+    from daemon import run_daemon
+
+    # Parquet: a closed file per poll, since a file only becomes readable once closed.
+    writer = _new_writer(config, args, file_per_flush=True)
+    print(f"Writing new jobs to {writer.path}")
+
+    def scrape(board):
+        return list(_maybe_enrich(_iter_board(board, config), config))
+
+    def write_metrics(board):
+        if args.metrics:
+            get_metrics().write_json(args.metrics)
+        if args.prometheus:
+            get_metrics().write_prometheus(args.prometheus)
+
+    try:
+        run_daemon(config, boards, store, writer, scrape, on_poll=write_metrics)
+    finally:
+        writer.close()
+    if not writer.count and os.path.isfile(writer.path):
+        os.remove(writer.path)
+    print(f"Saved {writer.count} new jobs to {writer.path}" if writer.count else "No new jobs found.")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape remote AI jobs into a CSV or Parquet dataset.")
+    parser.add_argument(
+        "--new-only",
+        action="store_true",
+        help="only write jobs first seen in this run (requires the job store)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="write jobs as they arrive instead of after every board finishes",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="keep running, polling each board on its interval and writing only new jobs",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["csv", "parquet"],
+        help="output format (default: output_format in config.json, else csv)",
+    )
+    parser.add_argument(
+        "--boards",
+        metavar="KEYS",
+        help="comma-separated boards to run, overriding boards.<key>.enabled (e.g. remoteok,himalayas)",
+    )
+    parser.add_argument(
+        "--skip",
+        metavar="KEYS",
+        help="comma-separated boards to leave out of this run",
+    )
+    parser.add_argument(
+        "--list-boards",
+        action="store_true",
+        help="list the known boards and whether they are enabled, then exit",
+    )
+    parser.add_argument(
+        "--timing",
+        action="store_true",
+        help="report startup, import and total run time",
+    )
+    parser.add_argument(
+        "--record",
+        metavar="ARCHIVE",
+        help="save every HTTP exchange to this .jsonl.gz archive for --replay",
+    )
+    parser.add_argument(
+        "--replay",
+        metavar="ARCHIVE",
+        help="serve HTTP responses from an archive made by --record (no network)",
+    )
+    parser.add_argument(
+        "--replay-latency",
+        metavar="SECONDS",
+        help='with --replay, sleep this long per request, or "recorded" for the original timings',
+    )
+    parser.add_argument(
+        "--metrics",
+        metavar="PATH",
+        help="write a JSON report of per-board request, latency and job metrics",
+    )
+    parser.add_argument(
+        "--prometheus",
+        metavar="PATH",
+        help="write the same metrics in Prometheus text format (e.g. for node_exporter's textfile collector)",
+    )
+    parser.add_argument(
+        "--max-total",
+        type=int,
+        help="stop every board once this many distinct jobs have been found in total (cross-board duplicates don't count)",
+    )
+    parser.add_argument(
+        "--max-seconds",
+        type=float,
+        help="run deadline in seconds: boards stop, requests are cut off and partial results are written",
+    )
+    return parser.parse_args(argv)
+
+
+def print_timing(main_started):
+    """Print the --timing report."""
+    now = time.perf_counter()
+    print(f"Timing: startup {(main_started - _STARTED) * 1000:.0f} ms, "
+          f"total {now - _STARTED:.2f} s")
+    for module_name, secs in _import_times.items():
+        print(f"  import {module_name}: {secs * 1000:.0f} ms")
+
+
+def _split(value):
+    return [v.strip() for v in value.split(",") if v.strip()] if value else []
+
+
+def list_boards(config):
+    """Print the --list-boards table."""
+    for board in BOARDS:
+        state = "enabled" if board.is_enabled(config) else "disabled"
+        print(f"{board.key:<16}{board.name:<18}{board.host:<26}cost ~{board.cost:>3}s  {state}")
+
+
+def main(argv=None):
+    main_started = time.perf_counter()
+    args = parse_args(argv)
+
+    with open("config.json") as f:
+        config = json.load(f)
+
+    if args.list_boards:
+        list_boards(config)
+        return
+    try:
+        boards = select_boards(config, _split(args.boards), _split(args.skip))
+    except ValueError as e:
+        print(e)
+        return
+    if not boards:
+        print("No boards selected. Enable some under \"boards\" in `config.json` or pass --boards.")
+        return
+
+    store = JobStore.from_config(config)
+    if (args.new_only or args.daemon) and not store:
+        print("--new-only and --daemon need the job store; enable \"store\" in `config.json`.")
+        return
+    run_id = store.start_run() if store and not args.daemon else None
+
+    # A run budget bounds one-shot runs; a daemon never finishes, so a
+    # deadline counted from start-up would end all its requests.
+    budget = None if args.daemon else RunBudget.from_config(
+        config, args.max_total, args.max_seconds, is_new=new_job_check(config)
+    )
+    if args.daemon and (args.max_total or args.max_seconds):
+        print("--max-total and --max-seconds are ignored with --daemon.")
+
+    if args.record or args.replay:
+        http = config.setdefault("http", {})
+        http.update(record=args.record, replay=args.replay, replay_latency=args.replay_latency)
+
+    if args.daemon:
+        from daemon import clip_cache_ttls
+
+        clip_cache_ttls(config, boards)
+
+    # Create the shared pooled client up front so it picks up config["http"]
+    client = get_client(config)
+    client.budget = budget
+    try:
+        if args.daemon:
+            run_daemon_mode(config, args, store, boards)
+        else:
+            if args.stream or config.get("streaming"):
+                path = run_streaming(config, args, store, run_id, budget, boards)
+            else:
+                path = run_batch(config, args, store, run_id, budget, boards)
+            report_boards(boards, budget, path)
+            if budget and budget.exhausted():
+                print(f"Run budget reached after {budget.count} jobs; remaining pages were skipped.")
+    finally:
+        if client.recorder:
+            print(f"Recorded {client.recorder.count} HTTP exchanges to {client.recorder.path}")
+        close_client()
+        save_history()
+        if store:
+            store.close()
+        if args.metrics:
+            get_metrics().write_json(args.metrics)
+            print(f"Saved run metrics to {args.metrics}")
+        if args.prometheus:
+            get_metrics().write_prometheus(args.prometheus)
+        if args.timing:
+            print_timing(main_started)
 
 
 if __name__ == "__main__":
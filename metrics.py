@@ -0,0 +1,287 @@
+import json
+import threading
+import time
+
+
+# Upper bounds (seconds) of the request latency histogram buckets.
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class BoardMetrics:
+    """Counters for one board. Updated through RunMetrics, which holds the lock."""
+
+    def __init__(self, name):
+        self.name = name
+        self.requests = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.retries = 0
+        self.hedges = 0
+        self.bytes = 0
+        self.statuses = {}
+        self.latency_sum = 0.0
+        self.latency_counts = [0] * (len(LATENCY_BUCKETS) + 1)  # last one is +Inf
+        self.rate_limit_wait = 0.0
+        self.busy_seconds = 0.0
+        self.parse_seconds = 0.0
+        self.jobs_in = 0
+        self.jobs_out = 0
+        self.status = None
+        self.status_detail = None
+
+    def observe_latency(self, seconds):
+        self.latency_sum += seconds
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.latency_counts[i] += 1
+                return
+        self.latency_counts[-1] += 1
+
+    def latency_quantile(self, q):
+        """Estimate a latency quantile as the upper bound of its histogram bucket."""
+        total = sum(self.latency_counts)
+        if not total:
+            return None
+        seen = 0
+        for bound, n in zip(LATENCY_BUCKETS + (float("inf"),), self.latency_counts):
+            seen += n
+            if seen >= q * total:
+                return bound
+        return float("inf")
+
+    def to_dict(self):
+        timed = sum(self.latency_counts)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "cache_hits": self.cache_hits,
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "status_429": self.statuses.get(429, 0),
+            "statuses": {str(k): v for k, v in sorted(self.statuses.items())},
+            "bytes": self.bytes,
+            "latency_seconds": {
+                "sum": round(self.latency_sum, 4),
+                "mean": round(self.latency_sum / timed, 4) if timed else None,
+                "p50": self.latency_quantile(0.5),
+                "p95": self.latency_quantile(0.95),
+                "buckets": dict(zip([str(b) for b in LATENCY_BUCKETS] + ["+Inf"], self.latency_counts)),
+            },
+            "rate_limit_wait_seconds": round(self.rate_limit_wait, 4),
+            "busy_seconds": round(self.busy_seconds, 4),
+            "parse_seconds": round(self.parse_seconds, 4),
+            "jobs_in": self.jobs_in,
+            "jobs_out": self.jobs_out,
+            "status": self.status,
+            "status_detail": self.status_detail,
+        }
+
+
+class RunMetrics:
+    """Per-board network and pipeline metrics for one run.
+
+    The HTTP client records every request (status, bytes, latency, time
+    spent waiting on the rate limiter, cache hits, errors, retries, hedged
+    duplicates), the board runner records jobs scraped and the time spent inside each
+    scraper, and the output stage records which jobs were kept. The result
+    is exported as a JSON report (write_json) or Prometheus text format
+    (to_prometheus).
+
+    parse_seconds is the time spent inside a scraper minus the time its
+    thread spent in HTTP requests: parsing, filtering and, for Himalayas,
+    waiting on prefetched pages.
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self.boards = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def board(self, name):
+        name = name or "other"
+        board = self.boards.get(name)
+        if board is None:
+            with self._lock:
+                board = self.boards.setdefault(name, BoardMetrics(name))
+        return board
+
+    def thread_network_seconds(self):
+        """Seconds this thread has spent in HTTP requests and rate-limit waits."""
+        return getattr(self._local, "network", 0.0)
+
+    def record_request(self, board, status, nbytes, latency, waited=0.0, error=False):
+        b = self.board(board)
+        with self._lock:
+            b.requests += 1
+            b.bytes += nbytes
+            b.rate_limit_wait += waited
+            b.observe_latency(latency)
+            if error:
+                b.errors += 1
+            else:
+                b.statuses[status] = b.statuses.get(status, 0) + 1
+        self._local.network = self.thread_network_seconds() + latency + waited
+
+    def record_bytes(self, board, nbytes, seconds=0.0):
+        """Count body bytes read after record_request(), for streamed responses."""
+        b = self.board(board)
+        with self._lock:
+            b.bytes += nbytes
+        self._local.network = self.thread_network_seconds() + seconds
+
+    def record_cache_hit(self, board, nbytes):
+        b = self.board(board)
+        with self._lock:
+            b.cache_hits += 1
+            b.bytes += nbytes
+
+    def record_retry(self, board):
+        b = self.board(board)
+        with self._lock:
+            b.retries += 1
+
+    def record_hedge(self, board):
+        b = self.board(board)
+        with self._lock:
+            b.hedges += 1
+
+    def record_scrape(self, board, busy, network):
+        b = self.board(board)
+        with self._lock:
+            b.busy_seconds += busy
+            b.parse_seconds += max(busy - network, 0.0)
+
+    def finish_board(self, board, status, detail=None):
+        """Record how a board's run ended: "complete", "partial", "failed" or "timed_out".
+
+        A board main.py gave up on stays "timed_out" even if its thread ends
+        normally later.
+        """
+        b = self.board(board)
+        with self._lock:
+            if b.status != "timed_out":
+                b.status = status
+                b.status_detail = detail
+
+    def count_in(self, board, n=1):
+        b = self.board(board)
+        with self._lock:
+            b.jobs_in += n
+
+    def count_out(self, job):
+        """Count a job written to the output, under every board it came from."""
+        boards = [self.board(source) for source in job.get("sources") or [job.get("source")]]
+        with self._lock:
+            for b in boards:
+                b.jobs_out += 1
+
+    def to_dict(self):
+        with self._lock:
+            boards = {name: b.to_dict() for name, b in sorted(self.boards.items())}
+        totals = {}
+        for key in ("requests", "errors", "cache_hits", "retries", "hedges", "status_429", "bytes",
+                    "rate_limit_wait_seconds", "parse_seconds", "jobs_in", "jobs_out"):
+            totals[key] = round(sum(b[key] for b in boards.values()), 4)
+        return {
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+            "duration_seconds": round(time.time() - self.started, 3),
+            "totals": totals,
+            "boards": boards,
+        }
+
+    def write_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def to_prometheus(self):
+        """Render the metrics in the Prometheus text exposition format."""
+        with self._lock:
+            boards = sorted(self.boards.items())
+            lines = []
+
+            def metric(name, kind, help_text, samples):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    label_text = ",".join(f'{k}="{v}"' for k, v in labels)
+                    lines.append(f"{name}{{{label_text}}} {value}")
+
+            def per_board(attr):
+                return [((("board", n),), getattr(b, attr)) for n, b in boards]
+
+            metric("scraper_requests_total", "counter", "HTTP requests sent.", per_board("requests"))
+            metric("scraper_request_errors_total", "counter", "HTTP requests that raised.", per_board("errors"))
+            metric("scraper_cache_hits_total", "counter", "Responses served from the HTTP cache.", per_board("cache_hits"))
+            metric("scraper_retries_total", "counter", "HTTP requests retried.", per_board("retries"))
+            metric("scraper_hedges_total", "counter", "Duplicate requests sent for slow ones.", per_board("hedges"))
+            metric("scraper_responses_total", "counter", "HTTP responses by status code.", [
+                ((("board", n), ("status", status)), count)
+                for n, b in boards for status, count in sorted(b.statuses.items())
+            ])
+            metric("scraper_bytes_total", "counter", "Response body bytes received.", per_board("bytes"))
+            metric("scraper_rate_limit_wait_seconds_total", "counter", "Time spent waiting on the rate limiter.",
+                   per_board("rate_limit_wait"))
+            metric("scraper_parse_seconds_total", "counter", "Time spent in scrapers outside HTTP requests.",
+                   per_board("parse_seconds"))
+            metric("scraper_jobs_in_total", "counter", "Matching jobs scraped, before dedupe.", per_board("jobs_in"))
+            metric("scraper_jobs_out_total", "counter", "Jobs written to the output.", per_board("jobs_out"))
+            metric("scraper_board_complete", "gauge", "1 if the board's scrape ran to completion.", [
+                ((("board", n),), int(b.status == "complete")) for n, b in boards if b.status
+            ])
+
+            lines.append("# HELP scraper_request_latency_seconds HTTP request latency.")
+            lines.append("# TYPE scraper_request_latency_seconds histogram")
+            for n, b in boards:
+                cumulative = 0
+                for bound, count in zip([str(x) for x in LATENCY_BUCKETS] + ["+Inf"], b.latency_counts):
+                    cumulative += count
+                    lines.append(f'scraper_request_latency_seconds_bucket{{board="{n}",le="{bound}"}} {cumulative}')
+                lines.append(f'scraper_request_latency_seconds_sum{{board="{n}"}} {b.latency_sum}')
+                lines.append(f'scraper_request_latency_seconds_count{{board="{n}"}} {cumulative}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+
+
+def track_board(board, jobs):
+    """Yield jobs from a scraper, recording jobs_in and the time spent inside it."""
+    metrics = get_metrics()
+    iterator = iter(jobs)
+    try:
+        while True:
+            started = time.perf_counter()
+            network = metrics.thread_network_seconds()
+            try:
+                job = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                metrics.record_scrape(
+                    board,
+                    time.perf_counter() - started,
+                    metrics.thread_network_seconds() - network,
+                )
+            metrics.count_in(board)
+            yield job
+    finally:
+        close = getattr(iterator, "close", None)
+        if close:
+            close()
+
+
+_metrics = RunMetrics()
+
+
+def get_metrics():
+    """Return the process-wide RunMetrics."""
+    return _metrics
+
+
+def reset_metrics():
+    """Start a fresh RunMetrics, e.g. between runs in one process."""
+    global _metrics
+    _metrics = RunMetrics()
+    return _metrics
@@ -0,0 +1,265 @@
+import functools
+import hashlib
+import random
+import re
+
+
+# Order in which boards' copies of the same posting are preferred: the
+# company's own ATS first, then boards with full descriptions and ids.
+DEFAULT_SOURCE_PRIORITY = [
+    "greenhouse", "himalayas", "remoteok", "jobicy", "remotive",
+    "arbeitnow", "themuse", "weworkremotely", "remoteco",
+]
+
+_COMPANY_SUFFIXES = {
+    "inc", "incorporated", "llc", "ltd", "limited", "corp", "corporation",
+    "co", "company", "gmbh", "ag", "sa", "sas", "bv", "plc", "pty", "srl", "oy", "ab",
+}
+
+_TITLE_ABBREVIATIONS = {
+    "sr": "senior", "snr": "senior", "jr": "junior",
+    "eng": "engineer", "engr": "engineer", "mgr": "manager",
+    "dev": "developer", "ml": "machine learning", "swe": "software engineer",
+}
+
+# Words that only describe where/how a role is offered, not what it is.
+_TITLE_NOISE = {"remote", "worldwide", "anywhere", "fully", "m", "f", "w", "d", "x"}
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+_BRACKETED = re.compile(r"\([^)]*\)|\[[^\]]*\]")
+
+_EMPTY = (1 << 64) - 1
+
+# Title MinHash: hash i of a shingle is (a_i * h + b_i) mod _PRIME over its
+# 64-bit blake2b hash h, with fixed a_i, b_i so signatures are stable across runs.
+_PRIME = (1 << 61) - 1
+_rng = random.Random(0x6A6F6273)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(_PRIME)) for _ in range(256)]
+
+
+def normalize_company(name):
+    """Reduce a company name to a comparison key, e.g. "Acme, Inc." -> "acme"."""
+    words = _NON_WORD.sub(" ", (name or "").lower().replace("&", " and ")).split()
+    while len(words) > 1 and words[-1] in _COMPANY_SUFFIXES:
+        words.pop()
+    return "".join(words)
+
+
+def normalize_title(title):
+    """Reduce a title to a comparison key.
+
+    Abbreviations are expanded and location noise dropped, so
+    "Sr. ML Engineer (Remote)" and "Senior Machine Learning Engineer" match.
+    """
+    text = _BRACKETED.sub(" ", (title or "").lower()).replace("&", " and ")
+    words = []
+    for word in _NON_WORD.sub(" ", text).split():
+        if word in _TITLE_NOISE:
+            continue
+        words.append(_TITLE_ABBREVIATIONS.get(word, word))
+    return " ".join(words)
+
+
+def _title_shingles(title_key):
+    """Title words and word bigrams."""
+    words = title_key.split()
+    shingles = set(words)
+    shingles.update(" ".join(p) for p in zip(words, words[1:]))
+    return frozenset(shingles)
+
+
+def _description_shingles(description):
+    """Word trigrams of the start of the description."""
+    words = _NON_WORD.sub(" ", (description or "")[:1000].lower()).split()
+    return {" ".join(p) for p in zip(words, words[1:], words[2:])}
+
+
+def jaccard(a, b):
+    """Exact Jaccard similarity of two sets."""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def _hash64(shingle):
+    return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def minhash(shingles, num_perm):
+    """Classic MinHash: the minimum of each of num_perm hash functions over the shingles.
+
+    Unlike signature(), every slot is filled however few shingles there are,
+    which LSH banding needs: a title has only a handful of shingles, and
+    bands of empty one-permutation bins would all share one bucket.
+    """
+    hashes = [_hash64(s) for s in shingles]
+    if not hashes:
+        return (_EMPTY,) * num_perm
+    return tuple(min([(a * h + b) % _PRIME for h in hashes]) for a, b in _PERMUTATIONS[:num_perm])
+
+
+@functools.lru_cache(maxsize=65536)
+def _title_minhash(title_key, num_perm):
+    """MinHash of a normalized title. Memoized: titles repeat across companies and polls."""
+    return minhash(_title_shingles(title_key), num_perm)
+
+
+def signature(shingles, num_perm):
+    """One-permutation MinHash: each shingle is hashed once and lands in one bin.
+
+    Bin i keeps the smallest hash whose value mod num_perm is i, so building
+    a signature costs O(shingles) rather than O(shingles * num_perm).
+    """
+    sig = [_EMPTY] * num_perm
+    for s in shingles:
+        h = _hash64(s)
+        i = h % num_perm
+        if h < sig[i]:
+            sig[i] = h
+    return sig
+
+
+def similarity(a, b):
+    """Estimated Jaccard similarity of two signatures (ignoring bins empty in both)."""
+    same = used = 0
+    for x, y in zip(a, b):
+        if x == _EMPTY and y == _EMPTY:
+            continue
+        used += 1
+        if x == y:
+            same += 1
+    return same / used if used else 1.0
+
+
+class NearDuplicateIndex:
+    """Incremental index that recognises jobs already seen under another guise.
+
+    Two jobs are duplicates when their normalized companies match and their
+    titles match on their own: the normalized titles are equal, or the
+    Jaccard similarity of their word/bigram shingles reaches `threshold`.
+    When both have a description, the MinHash similarity of description
+    trigrams must also reach `description_threshold`, which only confirms a
+    title match and can never create one; otherwise shared company
+    boilerplate would merge different roles. Two records from the same
+    board with different source_ids are never duplicates.
+
+    Candidates are found via LSH over a MinHash of the title shingles: the
+    signature is split into `bands` bands of num_perm / bands rows, and only
+    jobs sharing a band bucket (within the same company) are compared. With
+    the default 16 bands of 4 rows, titles with a Jaccard similarity of 0.6
+    are candidates 9 times in 10, and unrelated titles of one company (that
+    only share words like "senior" or "engineer") a few times in 100, so
+    the comparisons grow with the number of similar titles, not with the
+    square of the company's job count.
+    """
+
+    def __init__(self, threshold=0.6, description_threshold=0.4, num_perm=64, bands=16):
+        self.threshold = threshold
+        self.description_threshold = description_threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._exact = {}
+        self._buckets = {}
+        self._groups = []  # (source, source_id, title shingles, description signature)
+
+    @classmethod
+    def from_config(cls, config):
+        settings = (config or {}).get("dedupe") or {}
+        return cls(
+            threshold=settings.get("threshold", 0.6),
+            description_threshold=settings.get("description_threshold", 0.4),
+        )
+
+    def add(self, job):
+        """Index job and return (group id, is_new).
+
+        is_new is False when job duplicates an earlier one, in which case the
+        earlier job's group id is returned and job itself is not indexed.
+        """
+        company = normalize_company(job.get("company"))
+        title = normalize_title(job.get("title"))
+        source, source_id = job.get("source"), job.get("source_id")
+        description = _description_shingles(job.get("description"))
+        desc_sig = signature(description, self.num_perm) if description else None
+
+        exact = self._exact.get((company, title))
+        if exact is not None and self._confirms(exact, source, source_id, desc_sig):
+            return exact, False
+
+        title_shingles = _title_shingles(title)
+        title_sig = _title_minhash(title, self.num_perm)
+        band_keys = [
+            (company, b, title_sig[b * self.rows:(b + 1) * self.rows])
+            for b in range(self.bands)
+        ]
+        checked = {exact}
+        for key in band_keys:
+            for other in self._buckets.get(key, ()):
+                if other in checked:
+                    continue
+                checked.add(other)
+                if (jaccard(title_shingles, self._groups[other][2]) >= self.threshold
+                        and self._confirms(other, source, source_id, desc_sig)):
+                    self._exact.setdefault((company, title), other)
+                    return other, False
+
+        group = len(self._groups)
+        self._groups.append((source, source_id, title_shingles, desc_sig))
+        self._exact.setdefault((company, title), group)
+        for key in band_keys:
+            self._buckets.setdefault(key, []).append(group)
+        return group, True
+
+    def _confirms(self, group, source, source_id, desc_sig):
+        """Whether a title match with `group` holds up against the other evidence."""
+        other_source, other_id, _, other_sig = self._groups[group]
+        if source and source == other_source and source_id and other_id and source_id != other_id:
+            return False  # two distinct postings on one board
+        if desc_sig is None or other_sig is None:
+            return True
+        return similarity(desc_sig, other_sig) >= self.description_threshold
+
+
+def _rank(job, priority):
+    source = job.get("source")
+    rank = priority.index(source) if source in priority else len(priority)
+    return (rank, -len(job.get("description") or ""))
+
+
+def merge_near_duplicates(jobs, config=None):
+    """Collapse cross-board near-duplicates, keeping the best-sourced record.
+
+    Within each duplicate group the record from the highest-priority board
+    (config["dedupe"]["source_priority"], else DEFAULT_SOURCE_PRIORITY) is
+    kept, with empty description/tags/date filled in from the others. Every
+    returned job gets a "sources" list naming all boards it appeared on.
+    Groups are returned in order of first appearance.
+    """
+    settings = (config or {}).get("dedupe") or {}
+    priority = settings.get("source_priority") or DEFAULT_SOURCE_PRIORITY
+    index = NearDuplicateIndex.from_config(config)
+
+    groups = []
+    for job in jobs:
+        group, is_new = index.add(job)
+        if is_new:
+            groups.append([job])
+        else:
+            groups[group].append(job)
+
+    merged = []
+    for members in groups:
+        members_by_rank = sorted(members, key=lambda j: _rank(j, priority))
+        best = dict(members_by_rank[0])
+        for other in members_by_rank[1:]:
+            for field in ("description", "tags", "date_posted"):
+                if not best.get(field) and other.get(field):
+                    best[field] = other[field]
+        sources = []
+        for j in members_by_rank:
+            if j.get("source") and j["source"] not in sources:
+                sources.append(j["source"])
+        best["sources"] = sources
+        merged.append(best)
+    return merged
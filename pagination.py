@@ -0,0 +1,157 @@
+import json
+import os
+import threading
+
+from utils import board_config
+
+
+# Weight of the latest run in a stream's historical matches-per-page.
+_HISTORY_WEIGHT = 0.5
+
+
+class PaginationHistory:
+    """Matches-per-page of every listing stream over past runs, kept as JSON.
+
+    A stream is one paginated query on one board (a Muse category x level,
+    a remote.co category, ...). Its entry holds an exponentially weighted
+    average of matches per page and how many runs it has been seen in.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.streams = json.load(f)
+        except (OSError, ValueError):
+            self.streams = {}
+
+    def get(self, key):
+        with self._lock:
+            return self.streams.get(key)
+
+    def update(self, key, pages, matched):
+        if not pages:
+            return
+        with self._lock:
+            entry = self.streams.get(key)
+            per_page = matched / pages
+            if entry:
+                per_page = _HISTORY_WEIGHT * per_page + (1 - _HISTORY_WEIGHT) * entry["yield"]
+            self.streams[key] = {
+                "yield": round(per_page, 4),
+                "pages": pages,
+                "runs": (entry or {}).get("runs", 0) + 1,
+            }
+
+    def save(self):
+        with self._lock:
+            data = json.dumps(self.streams, indent=1, sort_keys=True)
+        dirname = os.path.dirname(self.path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp, self.path)
+
+
+class Pager:
+    """Decides page by page whether paginating one listing stream is still worth it.
+
+    Paging stops after `patience` consecutive pages that produced no
+    matching job, and never goes past `max_pages` unless pages keep
+    paying off: when the last allowed page's share of matching jobs is at
+    least `extend_yield`, one more page is allowed, up to `hard_max_pages`.
+    A stream that matched nothing in past runs (see PaginationHistory) starts
+    with a budget of `min_pages`, restored to the full budget as soon as one
+    of its pages matches.
+
+    Scrapers pass their own defaults; boards.<board>.pagination in
+    config.json overrides them:
+
+        "pagination": {"max_pages": 3, "patience": 1, "extend_yield": 0.25,
+                       "hard_max_pages": 6, "min_pages": 1}
+    """
+
+    def __init__(self, key, history=None, max_pages=3, patience=1, extend_yield=0.25,
+                 hard_max_pages=None, min_pages=1):
+        self.key = key
+        self.history = history
+        self.max_pages = max_pages
+        self.hard_max_pages = hard_max_pages or max_pages * 2
+        self.patience = max(patience, 1)
+        self.extend_yield = extend_yield
+        self.pages = 0
+        self.matched = 0
+        self.dry = 0
+
+        past = history.get(key) if history else None
+        if past and past.get("runs", 0) >= 1 and not past.get("yield"):
+            self.limit = min(min_pages, max_pages)
+        else:
+            self.limit = max_pages
+
+    @classmethod
+    def for_board(cls, config, board, key, **defaults):
+        """Build a Pager for one stream of `board` from its defaults and config."""
+        settings = dict(defaults)
+        settings.update(board_config(config, board).get("pagination") or {})
+        return cls(f"{board}/{key}", get_history(config), **settings)
+
+    def stopped(self):
+        return self.dry >= self.patience
+
+    def allows(self, index):
+        """True if the page at 0-based `index` may be fetched (e.g. prefetched)."""
+        return not self.stopped() and index < self.limit
+
+    def more(self):
+        """True if the next page should be fetched."""
+        return self.allows(self.pages)
+
+    def record(self, scanned, matched):
+        """Report how many listings the page had and how many of them matched."""
+        self.pages += 1
+        self.matched += matched
+        self.dry = 0 if matched else self.dry + 1
+        if not matched:
+            return
+        if self.limit < self.max_pages:
+            self.limit = self.max_pages  # history was wrong: stream is productive again
+        elif (self.pages >= self.limit and self.limit < self.hard_max_pages
+              and scanned and matched / scanned >= self.extend_yield):
+            self.limit += 1
+
+    def finish(self):
+        """Fold this run's yield into the history."""
+        if self.history:
+            self.history.update(self.key, self.pages, self.matched)
+
+
+_history = None
+_history_lock = threading.Lock()
+
+
+def get_history(config=None):
+    """Return the process-wide PaginationHistory, or None if disabled.
+
+    Settings: "pagination": {"history": true, "history_path": ".cache/pagination.json"}
+    """
+    global _history
+    settings = (config or {}).get("pagination") or {}
+    if not settings.get("history", True):
+        return None
+    if _history is None:
+        with _history_lock:
+            if _history is None:
+                _history = PaginationHistory(
+                    settings.get("history_path") or os.path.join(".cache", "pagination.json")
+                )
+    return _history
+
+
+def save_history():
+    """Persist the pagination history, if it was used this run."""
+    if _history is not None:
+        _history.save()
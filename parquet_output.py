@@ -0,0 +1,135 @@
+import os
+import time
+
+
+# Low-cardinality string columns stored dictionary-encoded.
+_DICTIONARY_COLUMNS = ("company", "location", "source")
+_STRING_COLUMNS = ("title", "url", "date_posted", "description", "source_id")
+
+
+def _schema(pa):
+    dict_string = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ("title", pa.string()),
+        ("company", dict_string),
+        ("location", dict_string),
+        ("url", pa.string()),
+        ("date_posted", pa.string()),
+        ("description", pa.string()),
+        ("tags", pa.list_(pa.string())),
+        ("source", dict_string),
+        ("source_id", pa.string()),
+        ("sources", pa.list_(pa.string())),
+        ("scraped_at", pa.timestamp("s", tz="UTC")),
+    ])
+
+
+class ParquetJobWriter:
+    """Append jobs to a date-partitioned Parquet dataset.
+
+    Each run writes one file under `<root>/run_date=YYYY-MM-DD/`, the Hive
+    partition layout that pyarrow.dataset, pandas.read_parquet, DuckDB and
+    Spark all understand, so a query over months of runs only opens the
+    partitions and columns it needs. company/location/source are
+    dictionary-encoded and tags is a real list<string> column.
+
+    Rows are buffered and written as a row group every `batch_size` jobs, so
+    this also works as the incremental writer for --stream.
+
+    With `file_per_flush` (the --daemon writer) there is no long-lived file:
+    every flush() writes the buffered rows to a new, closed file in the
+    partition of the current date, so each poll's jobs are readable as soon
+    as it ends and a daemon that is killed loses nothing. `path` is then the
+    dataset root.
+
+    pyarrow is an optional dependency, imported only when this is used.
+    """
+
+    def __init__(self, root=None, batch_size=1000, file_per_flush=False):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet output needs pyarrow: pip install pyarrow")
+        self._pa = pa
+        self._pq = pq
+        self.schema = _schema(pa)
+        self.batch_size = batch_size
+        self.count = 0
+        self.scraped_at = int(time.time())
+        self.root = root or os.path.join("outputs", "parquet")
+        self._rows = []
+        if file_per_flush:
+            os.makedirs(self.root, exist_ok=True)
+            self.path = self.root
+            self._writer = None
+        else:
+            self.path = _new_file(self.root)
+            self._writer = pq.ParquetWriter(self.path, self.schema, compression="zstd")
+
+    def write(self, job):
+        self._rows.append(job)
+        self.count += 1
+        if len(self._rows) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        if not self._rows:
+            return
+        pa = self._pa
+        rows, self._rows = self._rows, []
+        columns = {}
+        for name in _STRING_COLUMNS + _DICTIONARY_COLUMNS:
+            values = pa.array([str(job.get(name) or "") for job in rows], pa.string())
+            if name in _DICTIONARY_COLUMNS:
+                values = values.dictionary_encode()
+            columns[name] = values
+        columns["tags"] = pa.array(
+            [[str(t) for t in (job.get("tags") or [])] for job in rows],
+            pa.list_(pa.string()),
+        )
+        columns["sources"] = pa.array(
+            [[str(s) for s in (job.get("sources") or []) if s] for job in rows],
+            pa.list_(pa.string()),
+        )
+        if self._writer is None:
+            self.scraped_at = int(time.time())
+        columns["scraped_at"] = pa.array([self.scraped_at] * len(rows), self.schema.field("scraped_at").type)
+        table = pa.Table.from_arrays([columns[f.name] for f in self.schema], schema=self.schema)
+        if self._writer is None:
+            self._pq.write_table(table, _new_file(self.root), compression="zstd")
+        else:
+            self._writer.write_table(table)
+
+    def flush(self):
+        """Write buffered rows out now as a (possibly small) row group, or file."""
+        self._flush()
+
+    def close(self):
+        self._flush()
+        if self._writer is not None:
+            self._writer.close()
+
+
+def _new_file(root):
+    """A path for a new file in today's partition under root, never an existing one."""
+    partition = os.path.join(root, "run_date=" + time.strftime("%Y-%m-%d"))
+    os.makedirs(partition, exist_ok=True)
+    name = f"ai_jobs_{time.strftime('%H-%M-%S')}"
+    path = os.path.join(partition, name + ".parquet")
+    n = 1
+    while os.path.exists(path):
+        path = os.path.join(partition, f"{name}-{n}.parquet")
+        n += 1
+    return path
+
+
+def save_parquet(jobs, root=None):
+    """Write jobs to a new file in the date-partitioned Parquet dataset."""
+    writer = ParquetJobWriter(root)
+    try:
+        for job in jobs:
+            writer.write(job)
+    finally:
+        writer.close()
+    return writer.path
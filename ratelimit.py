@@ -0,0 +1,136 @@
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+from scrapers import get_board
+from utils import board_config
+
+
+# Used for any board without its own "rate_limit" entry in config.json.
+DEFAULT_RATE_LIMIT = {"rate": 2.0, "burst": 2}
+
+# After this many healthy responses in a row the rate is nudged back up.
+_SPEEDUP_AFTER = 5
+_SPEEDUP_FACTOR = 1.25
+
+
+def parse_retry_after(value):
+    """Return a Retry-After header value in seconds, or None if unparseable.
+
+    The header is either a number of seconds or an HTTP date.
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Adaptive token bucket pacing requests to a single host.
+
+    `rate` is requests per second and `burst` how many may go out back to back.
+    A 429/503 halves the rate (down to `min_rate`) and pauses the bucket for
+    Retry-After seconds; a run of healthy responses raises it again, up to
+    `max_rate`. Because the bucket starts full, the first request never waits
+    and nothing sleeps after the last one.
+    """
+
+    def __init__(self, rate, burst=1, max_rate=None, min_rate=None):
+        self.rate = float(rate)
+        self.burst = max(float(burst), 1.0)
+        self.max_rate = float(max_rate or rate * 2)
+        self.min_rate = float(min_rate or rate / 8)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._healthy = 0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, max_wait=None):
+        """Block until a request may be sent. Returns the seconds spent waiting.
+
+        Returns None without taking a token if that would mean waiting longer
+        than `max_wait` seconds in total.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self.blocked_until - now
+                if wait <= 0:
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return waited
+                    wait = (1 - self.tokens) / self.rate
+            if max_wait is not None and waited + wait > max_wait:
+                return None
+            time.sleep(wait)
+            waited += wait
+
+    def on_response(self, status_code, retry_after=None):
+        """Adapt the rate to the host's response."""
+        with self._lock:
+            if status_code in (429, 503):
+                self._healthy = 0
+                self.rate = max(self.rate / 2, self.min_rate)
+                delay = parse_retry_after(retry_after)
+                if delay is None:
+                    delay = 1 / self.rate
+                self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+                self.tokens = 0.0
+            elif status_code < 400:
+                self._healthy += 1
+                if self._healthy >= _SPEEDUP_AFTER and self.rate < self.max_rate:
+                    self.rate = min(self.rate * _SPEEDUP_FACTOR, self.max_rate)
+                    self._healthy = 0
+
+
+class RateLimiter:
+    """One TokenBucket per host, configured per board.
+
+    Settings come from `boards.<board>.rate_limit` in config.json, e.g.
+
+        "boards": {"remoteok": {"rate_limit": {"rate": 1.0, "burst": 1}}}
+
+    with optional "max_rate"/"min_rate". Boards without one use the default
+    from their scrapers.Board entry, then the top-level "rate_limit". Boards
+    sharing a host share a bucket; the first board to contact the host
+    decides its settings.
+    """
+
+    def __init__(self, config=None):
+        self.config = config or {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, host, board=None):
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(host)
+                if bucket is None:
+                    settings = dict(DEFAULT_RATE_LIMIT)
+                    settings.update(self.config.get("rate_limit") or {})
+                    registered = get_board(board)
+                    if registered and registered.rate_limit:
+                        settings.update(registered.rate_limit)
+                    settings.update(board_config(self.config, board).get("rate_limit") or {})
+                    bucket = TokenBucket(
+                        settings["rate"],
+                        burst=settings.get("burst", 1),
+                        max_rate=settings.get("max_rate"),
+                        min_rate=settings.get("min_rate"),
+                    )
+                    self._buckets[host] = bucket
+        return bucket
@@ -0,0 +1,107 @@
+import base64
+import gzip
+import json
+import threading
+import time
+
+import requests
+
+from cache import build_response, cache_key
+
+
+# Headers describing the wire encoding of the original body. The archive
+# stores the decoded body, so these must not be replayed with it.
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+class Recorder:
+    """Append every HTTP exchange the scrapers make to a gzipped JSONL archive.
+
+    One line per response: the request (url, params, cache key), the status,
+    headers and decoded body, plus how long the request took so replay can
+    reproduce the timing. UTF-8 bodies are stored as text, anything else as
+    base64, so the gzip layer compresses the bulk of the archive well.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._lock = threading.Lock()
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+
+    def record(self, url, params, resp, elapsed):
+        entry = {
+            "key": cache_key(url, params),
+            "url": url,
+            "params": params,
+            "status": resp.status_code,
+            "final_url": resp.url,
+            "headers": {k: v for k, v in resp.headers.items() if k.lower() not in _DROPPED_HEADERS},
+            "elapsed": round(elapsed, 4),
+        }
+        body = resp.content or b""
+        try:
+            entry["text"] = body.decode("utf-8")
+        except UnicodeDecodeError:
+            entry["body_b64"] = base64.b64encode(body).decode("ascii")
+        line = json.dumps(entry, separators=(",", ":"))
+        with self._lock:
+            self._file.write(line + "\n")
+            self.count += 1
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class Replayer:
+    """Serve responses from a Recorder archive instead of the network.
+
+    Requests are matched on URL plus query params. When the same request
+    was recorded several times its responses are served in recorded order,
+    the last one repeating once they run out. A request that was never
+    recorded raises requests.ConnectionError, which scrapers already treat
+    like a network failure.
+
+    `latency` simulates the network: None serves instantly, "recorded"
+    sleeps for each exchange's recorded duration and a number sleeps that
+    many seconds per request.
+    """
+
+    def __init__(self, path, latency=None):
+        self.path = path
+        self.latency = latency
+        self._entries = {}
+        self._served = {}
+        self._lock = threading.Lock()
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._entries.setdefault(entry["key"], []).append(entry)
+
+    def __len__(self):
+        return sum(len(v) for v in self._entries.values())
+
+    def get(self, url, params=None):
+        key = cache_key(url, params)
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                raise requests.ConnectionError(f"No recorded response for {url} (params={params})")
+            served = self._served.get(key, 0)
+            self._served[key] = served + 1
+            entry = entries[min(served, len(entries) - 1)]
+
+        if self.latency == "recorded":
+            time.sleep(entry.get("elapsed") or 0)
+        elif self.latency:
+            time.sleep(float(self.latency))
+
+        if "text" in entry:
+            body = entry["text"].encode("utf-8")
+        else:
+            body = base64.b64decode(entry.get("body_b64") or "")
+        resp = build_response(entry["status"], entry["final_url"], entry["headers"], body)
+        resp.from_replay = True
+        return resp
@@ -0,0 +1,126 @@
+import random
+import threading
+import time
+
+import requests
+
+from ratelimit import parse_retry_after
+
+
+# Statuses worth retrying: rate limiting and transient server/gateway errors.
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Raised instead of sending a request to a board whose circuit is open."""
+
+
+class RetryPolicy:
+    """Bounded retries with jittered exponential backoff.
+
+    Attempt n (0-based) waits a random time up to backoff * 2**n seconds,
+    capped at `max_backoff` ("full jitter", so threads that failed together
+    don't retry together). A Retry-After header is honoured by the host's
+    token bucket, which blocks for that long; a Retry-After longer than
+    `max_retry_after` is not worth waiting for and the response is returned
+    as is. Settings come from the "http" section of config.json:
+
+        "http": {"retries": 2, "backoff": 0.5, "max_backoff": 8, "max_retry_after": 60}
+    """
+
+    def __init__(self, retries=2, backoff=0.5, max_backoff=8.0, max_retry_after=60.0):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+
+    @classmethod
+    def from_config(cls, config):
+        http = (config or {}).get("http") or {}
+        return cls(
+            retries=http.get("retries", 2),
+            backoff=http.get("backoff", 0.5),
+            max_backoff=http.get("max_backoff", 8.0),
+            max_retry_after=http.get("max_retry_after", 60.0),
+        )
+
+    def too_long(self, retry_after):
+        """The Retry-After in seconds if it is longer than worth waiting for, else None."""
+        wait = parse_retry_after(retry_after)
+        if wait is not None and wait > self.max_retry_after:
+            return wait
+        return None
+
+    def delay(self, attempt, retry_after=None):
+        """Seconds to sleep before retry number `attempt`, or None to give up."""
+        if attempt >= self.retries or self.too_long(retry_after):
+            return None
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """Stops sending requests for a board after repeated failures.
+
+    After `failures` requests in a row failed (retries exhausted on an
+    exception or a RETRY_STATUSES response) the circuit opens and every
+    request for the board raises CircuitOpenError at once, instead of
+    each one spending its timeout and retries on a host that is down.
+    After `cooldown` seconds one trial request is let through: success
+    closes the circuit, failure opens it for another cooldown. A host
+    asking to be left alone for longer than RetryPolicy.max_retry_after
+    trips the circuit for that long (see trip()).
+
+        "http": {"breaker_failures": 5, "breaker_cooldown": 300}
+    """
+
+    def __init__(self, board, failures=5, cooldown=300.0):
+        self.board = board
+        self.threshold = max(failures, 1)
+        self.cooldown = cooldown
+        self.failures = 0
+        self.open_until = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def check(self):
+        """Raise CircuitOpenError unless a request may be sent now."""
+        with self._lock:
+            if self.open_until is None:
+                return
+            if not self._trial and time.monotonic() >= self.open_until:
+                self._trial = True  # half-open: this request is the trial
+                return
+        raise CircuitOpenError(f"{self.board}: circuit open after {self.failures} failed requests")
+
+    def success(self):
+        with self._lock:
+            self.failures = 0
+            self.open_until = None
+            self._trial = False
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.threshold:
+                self._open(self.cooldown)
+
+    def abandon(self):
+        """End a request that says nothing about the host (e.g. the run's deadline).
+
+        Neither a success nor a failure: a pending half-open trial is given
+        up so the next request may be the trial, and the count is untouched.
+        """
+        with self._lock:
+            self._trial = False
+
+    def trip(self, seconds):
+        """Open the circuit for `seconds`, e.g. a long Retry-After."""
+        with self._lock:
+            self.failures += 1
+            self._open(seconds)
+
+    def _open(self, seconds):
+        if self.open_until is None:
+            print(f"  {self.board}: {self.failures} failed requests, pausing the board for {seconds:.0f}s")
+        self.open_until = time.monotonic() + seconds
+        self._trial = False
@@ -0,0 +1,101 @@
+"""Registry of the job boards main.py can scrape.
+
+Each Board records where a scraper lives and what it costs to run, without
+importing it: a scraper module (and bs4/lxml for the HTML boards) is only
+imported when its board is selected for a run. Boards are turned on or off
+with boards.<key>.enabled in config.json, or per run with --boards/--skip.
+"""
+
+import importlib.util
+
+
+class Board:
+    """Metadata for one board's scraper.
+
+    `cost` is a rough estimate of the seconds a full run of the board takes
+    at its default rate limit (mostly request count / rate). Boards are
+    started most expensive first so the slowest ones never queue behind
+    cheap ones. `rate_limit` is the board's default token bucket, used unless
+    config.json sets boards.<key>.rate_limit. `needs_bs4` boards parse HTML
+    and need bs4, or lxml (see scrapers.html_backend). `interval` is how
+    often --daemon polls the board, in seconds, unless boards.<key>.interval
+    says otherwise.
+    """
+
+    def __init__(self, key, name, host, cost, rate_limit=None, needs_bs4=False, enabled=False, interval=600):
+        self.key = key
+        self.name = name
+        self.host = host
+        self.cost = cost
+        self.rate_limit = rate_limit
+        self.needs_bs4 = needs_bs4
+        self.enabled = enabled
+        self.interval = interval
+
+    @property
+    def target(self):
+        """The board's generator as a "module:function" string."""
+        return f"scrapers.{self.key}:iter_{self.key}"
+
+    def available(self):
+        """False if the board needs an HTML parser that isn't installed."""
+        if not self.needs_bs4:
+            return True
+        return any(importlib.util.find_spec(m) for m in ("bs4", "lxml"))
+
+    def is_enabled(self, config):
+        settings = ((config or {}).get("boards") or {}).get(self.key) or {}
+        return settings.get("enabled", self.enabled)
+
+
+# In merge order: results are combined in this order whatever order the
+# boards finish in, so exact dedupe keeps the same record every run.
+BOARDS = [
+    Board("remoteok", "RemoteOK", "remoteok.com", cost=6, rate_limit={"rate": 1.0, "burst": 1},
+          enabled=True, interval=300),
+    Board("jobicy", "Jobicy", "jobicy.com", cost=2, enabled=True, interval=300),
+    Board("themuse", "The Muse", "www.themuse.com", cost=6, enabled=True, interval=900),
+    Board("greenhouse", "Greenhouse", "boards-api.greenhouse.io", cost=6,
+          rate_limit={"rate": 3.0, "burst": 3}, enabled=True, interval=900),
+    Board("remotive", "Remotive", "remotive.io", cost=2, interval=300),
+    Board("arbeitnow", "Arbeitnow", "arbeitnow.com", cost=3, rate_limit={"rate": 1.0, "burst": 1}, interval=600),
+    Board("himalayas", "Himalayas", "himalayas.app", cost=13, rate_limit={"rate": 4.0, "burst": 4}, interval=900),
+    Board("remoteco", "remote.co", "remote.co", cost=40, rate_limit={"rate": 0.5, "burst": 1},
+          needs_bs4=True, interval=3600),
+    Board("weworkremotely", "We Work Remotely", "weworkremotely.com", cost=6,
+          rate_limit={"rate": 0.5, "burst": 1}, needs_bs4=True, interval=3600),
+]
+
+_BY_KEY = {board.key: board for board in BOARDS}
+
+
+def get_board(key):
+    """Return the Board registered under key, or None."""
+    return _BY_KEY.get(key)
+
+
+def select_boards(config, only=None, skip=()):
+    """Return the boards to run this time, most expensive first.
+
+    `only` (a list of keys, e.g. from --boards) replaces the enabled flags
+    from config.json; `skip` removes boards either way. Unknown keys raise
+    ValueError; boards whose HTML parser is missing are left out with a
+    message.
+    """
+    unknown = [k for k in list(only or []) + list(skip or []) if k not in _BY_KEY]
+    if unknown:
+        raise ValueError(f"Unknown board(s): {', '.join(unknown)} (known: {', '.join(_BY_KEY)})")
+
+    if only:
+        selected = [board for board in BOARDS if board.key in only]
+    else:
+        selected = [board for board in BOARDS if board.is_enabled(config)]
+    selected = [board for board in selected if board.key not in (skip or ())]
+
+    runnable = []
+    for board in selected:
+        if board.available():
+            runnable.append(board)
+        else:
+            print(f"Skipping {board.name}: needs bs4 or lxml (pip install beautifulsoup4)")
+    return sorted(runnable, key=lambda board: -board.cost)
@@ -1,50 +1,55 @@
-import requests
-import time
-from utils import job_matches
+from budget import claim, spent
+from http_client import get_client
+from pagination import Pager
+from utils import get_matcher
 
 
-def fetch_arbeitnow(config):
-    """Fetch jobs from Arbeitnow public API.
+def iter_arbeitnow(config, budget=None):
+    """Yield jobs from Arbeitnow public API.
 
     Arbeitnow has a free public API with remote filtering and keyword search.
     Only returns jobs where remote=true. Uses a single broad search term to
     avoid rate-limiting from rapid multi-term requests.
     Docs: https://arbeitnow.com/api
+
+    Paging is driven by a Pager: it stops after a page with no matching
+    jobs and continues past the usual 3 pages while pages keep matching.
     """
     base_url = "https://arbeitnow.com/api/job-board-api"
-    headers = {"User-Agent": "ai-job-scraper/1.0 (+https://github.com)"}
+    client = get_client(config)
     max_results = config.get("max_results_per_board") or 50
+    matcher = get_matcher(config)
 
     # Single broad term to avoid rate-limiting — local filter handles precision
     search_terms = ["AI engineer"]
 
     seen_slugs = set()
-    jobs = []
+    count = 0
 
     for term in search_terms:
-        if len(jobs) >= max_results:
+        if count >= max_results or spent(budget):
             break
 
         page = 1
-        while len(jobs) < max_results and page <= 3:  # cap at 3 pages to avoid rate limiting
+        pager = Pager.for_board(config, "arbeitnow", term, max_pages=3, patience=1)
+        while count < max_results and not spent(budget) and pager.more():
             try:
-                resp = requests.get(
+                resp = client.get(
                     base_url,
                     params={"search": term, "remote": "true", "page": page},
-                    headers=headers,
-                    timeout=15,
+                    board="arbeitnow",
                 )
                 resp.raise_for_status()
                 data = resp.json()
             except Exception as e:
                 print(f"  Arbeitnow term={term!r} page={page} failed: {e}")
                 break
-            time.sleep(1)  # be respectful, avoid 429s
 
             items = data.get("data", [])
             if not items:
                 break
 
+            matched = 0
             for item in items:
                 if not isinstance(item, dict):
                     continue
@@ -75,19 +80,30 @@ def fetch_arbeitnow(config):
                     "date_posted": date_posted,
                     "description": description.strip()[:1000],
                     "tags": tags,
+                    "source": "arbeitnow",
+                    "source_id": slug or url,
                 }
 
-                if job["title"] and job["company"] and job_matches(job, config):
-                    jobs.append(job)
+                if job["title"] and job["company"] and matcher.matches(job):
+                    if not claim(budget, job):
+                        return
+                    count += 1
+                    matched += 1
+                    yield job
 
-                if len(jobs) >= max_results:
+                if count >= max_results or spent(budget):
                     break
 
+            pager.record(len(items), matched)
+
             # Check if there are more pages
-            meta = data.get("meta", {})
             links = data.get("links", {})
             if not links.get("next"):
                 break
             page += 1
+        pager.finish()
+
 
-    return jobs
+def fetch_arbeitnow(config, budget=None):
+    """Return every job from iter_arbeitnow() as a list."""
+    return list(iter_arbeitnow(config, budget))
@@ -1,6 +1,8 @@
-import requests
-import time
-from utils import job_matches
+import html
+from budget import claim, spent
+from http_client import get_client
+from location import classify_location
+from utils import get_matcher
 
 
 # AI/ML companies with confirmed Greenhouse job boards that have remote listings.
@@ -18,26 +20,26 @@ _COMPANIES = [
 ]
 
 
-def fetch_greenhouse(config):
-    """Fetch remote AI/ML jobs from Greenhouse-hosted company job boards.
+def iter_greenhouse(config, budget=None):
+    """Yield remote AI/ML jobs from Greenhouse-hosted company job boards.
 
     Greenhouse is an ATS used by many tech/AI companies. Their public API
     at boards-api.greenhouse.io requires no authentication.
     We query each known company board and filter for remote roles.
     """
-    headers = {"User-Agent": "ai-job-scraper/1.0 (+https://github.com)"}
+    client = get_client(config)
     max_results = config.get("max_results_per_board") or 100
+    matcher = get_matcher(config)
     seen_ids = set()
-    jobs = []
+    count = 0
 
     for slug in _COMPANIES:
-        if len(jobs) >= max_results:
+        if count >= max_results or spent(budget):
             break
         try:
-            resp = requests.get(
+            resp = client.get(
                 f"https://boards-api.greenhouse.io/v1/boards/{slug}/jobs",
-                headers=headers,
-                timeout=15,
+                board="greenhouse",
             )
             resp.raise_for_status()
             data = resp.json()
@@ -45,8 +47,6 @@ def fetch_greenhouse(config):
             print(f"  Greenhouse {slug!r} failed: {e}")
             continue
 
-        time.sleep(0.3)
-
         for item in data.get("jobs", []):
             if not isinstance(item, dict):
                 continue
@@ -74,17 +74,44 @@ def fetch_greenhouse(config):
                 "location": location.strip(),
                 "url": url,
                 "date_posted": date_posted,
-                "description": "",  # Greenhouse job detail requires a second API call; skip for speed
+                "description": "",  # needs a second API call per job; see fetch_detail()
                 "tags": [],
+                "source": "greenhouse",
+                "source_id": f"{slug}/{job_id}",
             }
 
-            if job["title"] and job["company"] and job_matches(job, config):
-                jobs.append(job)
+            if job["title"] and job["company"] and matcher.matches(job):
+                if not claim(budget, job):
+                    return
+                count += 1
+                yield job
 
-            if len(jobs) >= max_results:
+            if count >= max_results or spent(budget):
                 break
 
-    return jobs
+
+def fetch_greenhouse(config, budget=None):
+    """Return every job from iter_greenhouse() as a list."""
+    return list(iter_greenhouse(config, budget))
+
+
+def fetch_detail(job, client, config):
+    """Return the full plain-text description of a Greenhouse job.
+
+    The board listing has no descriptions; they come from the per-job
+    endpoint, whose "content" field is HTML-escaped HTML. Used by the
+    enrichment stage (enrich.py) for jobs that already passed the filters.
+    """
+    from scrapers.html_backend import page_text, select_backend  # imported lazily: only enrichment parses HTML
+
+    slug, job_id = job["source_id"].split("/", 1)
+    resp = client.get(
+        f"https://boards-api.greenhouse.io/v1/boards/{slug}/jobs/{job_id}",
+        board="greenhouse",
+    )
+    resp.raise_for_status()
+    content = html.unescape(resp.json().get("content") or "")
+    return page_text(content, backend=select_backend(config))
 
 
 def _is_remote(location):
@@ -94,28 +121,5 @@ def _is_remote(location):
     Rejects: "Remote - California", "Remote - US", "New York (Remote)" — these
     are US/region-restricted even though they contain the word "remote".
     """
-    loc = (location or "").lower()
-    if not any(kw in loc for kw in ["remote", "worldwide", "anywhere", "distributed"]):
-        return False
-
-    # Reject if restricted to a specific US state or region
-    us_states = [
-        "alabama", "alaska", "arizona", "arkansas", "california", "colorado",
-        "connecticut", "delaware", "florida", "georgia", "hawaii", "idaho",
-        "illinois", "indiana", "iowa", "kansas", "kentucky", "louisiana",
-        "maine", "maryland", "massachusetts", "michigan", "minnesota",
-        "mississippi", "missouri", "montana", "nebraska", "nevada",
-        "new hampshire", "new jersey", "new mexico", "new york", "north carolina",
-        "north dakota", "ohio", "oklahoma", "oregon", "pennsylvania",
-        "rhode island", "south carolina", "south dakota", "tennessee", "texas",
-        "utah", "vermont", "virginia", "washington", "west virginia",
-        "wisconsin", "wyoming", "washington d.c.", "washington, d.c.",
-    ]
-    # Also reject city-specific locations in the US
-    us_cities = ["san francisco", "new york", "seattle", "austin", "boston", "chicago"]
-
-    for state in us_states + us_cities:
-        if state in loc:
-            return False
-
-    return True
+    verdict = classify_location(location)
+    return verdict.remote and "united states" not in verdict.countries
@@ -1,79 +1,115 @@
-import requests
-from utils import job_matches
-import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from budget import claim, spent
+from http_client import get_client
+from location import WORLDWIDE, classify_location
+from pagination import Pager
+from utils import board_config, get_matcher
 
 
-def fetch_himalayas(config):
-    """Fetch AI/ML jobs from Himalayas.app using their public JSON API.
+_BASE_URL = "https://himalayas.app/jobs/api"
+_PAGE_LIMIT = 20  # API max per request
+
+
+def iter_himalayas(config, budget=None):
+    """Yield AI/ML jobs from Himalayas.app using their public JSON API.
 
     Himalayas is a platform for remote-first companies with a free public API.
     They have ~113K jobs and explicitly allow scraping in robots.txt.
+
+    Pages are fetched ahead with a sliding window of `page_concurrency`
+    in-flight offsets (boards.himalayas in config.json) but consumed strictly
+    in offset order, so results match a sequential scan. A failed page is
+    skipped rather than ending the scan, and pages still outstanding when
+    max_results or the run budget is reached are cancelled. A Pager decides
+    how far to scan: by default up to 50 pages, stopping after 5 pages in a
+    row without a match.
     """
-    base_url = "https://himalayas.app/jobs/api"
-    headers = {"User-Agent": "ai-job-scraper/1.0 (+https://github.com)"}
-    
-    jobs = []
+    client = get_client(config)
+    settings = board_config(config, "himalayas")
+
+    count = 0
     max_results = config.get("max_results_per_board") or 50
-    limit = 20  # API max per request
-    offset = 0
-    
+    matcher = get_matcher(config)
+
     # Himalayas API search doesn't reliably filter by keyword, so we fetch
-    # broadly and rely on local title-based filtering. Use category param instead.
-    search_query = None
+    # broadly and rely on local title-based filtering.
+    # Most jobs on Himalayas are country-restricted, so we need to scan broadly
+    # and tolerate several pages in a row without a worldwide+matching title.
+    pager = Pager.for_board(config, "himalayas", "all", max_pages=50, patience=5, hard_max_pages=100)
+    window = max(settings.get("page_concurrency") or 4, 1)
+
+    def fetch_page(page):
+        offset = page * _PAGE_LIMIT
+        resp = client.get(f"{_BASE_URL}?limit={_PAGE_LIMIT}&offset={offset}", board="himalayas")
+        resp.raise_for_status()
+        return resp.json().get("jobs", [])
+
+    pool = ThreadPoolExecutor(max_workers=window)
+    in_flight = deque()
+    next_page = 0
+    try:
+        while count < max_results and not spent(budget) and pager.more():
+            while len(in_flight) < window and pager.allows(next_page):
+                in_flight.append((next_page, pool.submit(fetch_page, next_page)))
+                next_page += 1
+            if not in_flight:
+                break
 
-    # Fetch up to 50 pages (1000 jobs) to find enough worldwide+matching titles.
-    # Most jobs on Himalayas are country-restricted, so we need to scan broadly.
-    max_pages = 50
-    pages_fetched = 0
+            page, future = in_flight.popleft()
+            try:
+                job_list = future.result()
+            except Exception as e:
+                print(f"  Himalayas offset={page * _PAGE_LIMIT} failed: {e}")
+                pager.record(0, 0)
+                continue
 
-    try:
-        while len(jobs) < max_results and pages_fetched < max_pages:
-            url_params = f"limit={limit}&offset={offset}"
-            resp = requests.get(
-                f"{base_url}?{url_params}",
-                headers=headers,
-                timeout=15
-            )
-            resp.raise_for_status()
-            data = resp.json()
-
-            job_list = data.get("jobs", [])
             if not job_list:
-                break
+                break  # ran past the last page
 
+            matched = 0
             for item in job_list:
-                if len(jobs) >= max_results:
+                if count >= max_results or spent(budget):
                     break
 
                 if not _location_allowed(item, config):
                     continue
 
                 job_data = _parse_himalayas_job(item)
-                if job_data and job_matches(job_data, config):
-                    jobs.append(job_data)
-
-            offset += limit
-            pages_fetched += 1
-
-            # Rate limiting
-            time.sleep(0.5)
-            
-    except Exception as e:
-        print(f"Error fetching from Himalayas: {e}")
-    
-    return jobs
+                if job_data and matcher.matches(job_data):
+                    if not claim(budget, job_data):
+                        return
+                    count += 1
+                    matched += 1
+                    yield job_data
+            pager.record(len(job_list), matched)
+        pager.finish()
+    finally:
+        # Don't wait on pages we no longer need
+        for _, future in in_flight:
+            future.cancel()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def fetch_himalayas(config, budget=None):
+    """Return every job from iter_himalayas() as a list."""
+    return list(iter_himalayas(config, budget))
 
 
 def _location_allowed(item, config):
     """Return True only if the job has no location restrictions (truly worldwide).
 
-    Empty locationRestrictions ([]) = open to everyone.
-    Any non-empty list means the job is restricted to specific countries — skip it.
+    Empty locationRestrictions ([]) = open to everyone. A non-empty list
+    usually restricts the job to specific countries — skip it — unless the
+    entries themselves just say "Worldwide"/"Anywhere".
     """
     if not config.get("worldwide_only", True):
         return True  # location filtering disabled in config
     restrictions = item.get("locationRestrictions") or []
-    return len(restrictions) == 0
+    if not restrictions:
+        return True
+    names = ", ".join(r.get("name", "") if isinstance(r, dict) else str(r) for r in restrictions)
+    return classify_location(names).kind == WORLDWIDE
 
 
 def _parse_himalayas_job(item):
@@ -120,6 +156,8 @@ def _parse_himalayas_job(item):
             "date_posted": str(pub_date),
             "description": (description or "").strip()[:1000],
             "tags": tags,
+            "source": "himalayas",
+            "source_id": str(item.get("guid") or url),
         }
         
         # Only return if we have essential fields
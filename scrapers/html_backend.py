@@ -0,0 +1,98 @@
+"""Shared HTML parsing helpers for the scrapers that work off HTML pages.
+
+Two backends produce the same job dicts:
+
+- "lxml": libxml2's C parser plus XPath expressions compiled once at import.
+  Used automatically when lxml is installed.
+- "bs4": BeautifulSoup's html.parser, restricted with a SoupStrainer so only
+  the job-card subtrees are built into a tree.
+
+config.json may force one with "html_parser": "lxml" | "bs4" (default "auto").
+"""
+
+import functools
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:
+    etree = None
+
+
+_UPPER = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+_LOWER = "abcdefghijklmnopqrstuvwxyz"
+
+
+def select_backend(config):
+    """Return "lxml" or "bs4" for this run."""
+    choice = (config.get("html_parser") or "auto").lower()
+    if choice in ("auto", "lxml") and etree is not None:
+        return "lxml"
+    return "bs4"
+
+
+def class_contains(word, ignore_case=False):
+    """XPath predicate matching bs4's {"class": lambda x: x and word in x}."""
+    attr = f'translate(@class, "{_UPPER}", "{_LOWER}")' if ignore_case else "@class"
+    return f'contains({attr}, "{word}")'
+
+
+def xpath(expr):
+    """Compile an XPath expression, or return None when lxml is unavailable."""
+    return etree.XPath(expr) if etree is not None else None
+
+
+_TEXT = xpath(".//text()[not(ancestor::script) and not(ancestor::style)]")
+
+
+def parse_document(content):
+    """Parse an HTML page with lxml. Returns None for an empty body."""
+    if not content or not content.strip():
+        return None
+    return lxml.html.document_fromstring(content)
+
+
+def text_of(element, separator=""):
+    """lxml equivalent of bs4's element.get_text(separator, strip=True)."""
+    if element is None:
+        return ""
+    return separator.join(s.strip() for s in _TEXT(element) if s.strip())
+
+
+def first(compiled, element):
+    """Return the first node a compiled XPath selects, or None."""
+    found = compiled(element)
+    return found[0] if found else None
+
+
+@functools.lru_cache(maxsize=None)
+def _div_with_class(word):
+    return xpath(f'(//div[{class_contains(word)}])[1]')
+
+
+def page_text(content, class_words=(), backend="lxml"):
+    """Return the readable text of a detail page or HTML fragment.
+
+    Uses the first <div> whose class contains one of class_words (in order),
+    falling back to the text of the whole document.
+    """
+    if backend == "lxml":
+        doc = parse_document(content)
+        if doc is None:
+            return ""
+        for word in class_words:
+            element = first(_div_with_class(word), doc)
+            if element is not None:
+                return text_of(element, " ")
+        return text_of(doc, " ")
+
+    from bs4 import BeautifulSoup  # imported lazily: only HTML boards need it
+
+    soup = BeautifulSoup(content, "html.parser")
+    for word in class_words:
+        element = soup.find("div", {"class": lambda x: x and word in x})
+        if element:
+            return element.get_text(separator=" ", strip=True)
+    for element in soup(["script", "style"]):
+        element.decompose()
+    return soup.get_text(separator=" ", strip=True)
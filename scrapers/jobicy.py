@@ -1,36 +1,33 @@
-import requests
-from utils import job_matches
+from budget import claim, spent
+from http_client import get_client
+from utils import get_matcher
 import html
 
 
-def fetch_jobicy(config):
-    """Fetch jobs from Jobicy API.
+def iter_jobicy(config, budget=None):
+    """Yield jobs from Jobicy API.
 
     Jobicy is a remote-only job board with a free public API.
     Supports ?tag= for keyword filtering at the API level.
     Docs: https://jobicy.com/jobs-rss-feed
     """
     base_url = "https://jobicy.com/api/v2/remote-jobs"
-    headers = {"User-Agent": "ai-job-scraper/1.0 (+https://github.com)"}
+    client = get_client(config)
     max_results = config.get("max_results_per_board") or 50
+    matcher = get_matcher(config)
 
     # Jobicy ?tag= accepts a single term per request.
     # Use broad terms that return the most relevant results.
     search_tags = ["machine learning", "artificial intelligence", "generative AI"]
 
     seen_ids = set()
-    jobs = []
+    count = 0
 
     for tag in search_tags:
-        if len(jobs) >= max_results:
+        if count >= max_results or spent(budget):
             break
         try:
-            resp = requests.get(
-                base_url,
-                params={"count": 50, "tag": tag},
-                headers=headers,
-                timeout=15,
-            )
+            resp = client.get(base_url, params={"count": 50, "tag": tag}, board="jobicy")
             resp.raise_for_status()
             data = resp.json()
         except Exception as e:
@@ -70,12 +67,20 @@ def fetch_jobicy(config):
                 "date_posted": date_posted,
                 "description": description.strip()[:1000],
                 "tags": tags,
+                "source": "jobicy",
+                "source_id": str(job_id or url),
             }
 
-            if job["title"] and job["company"] and job_matches(job, config):
-                jobs.append(job)
+            if job["title"] and job["company"] and matcher.matches(job):
+                if not claim(budget, job):
+                    return
+                count += 1
+                yield job
 
-            if len(jobs) >= max_results:
+            if count >= max_results or spent(budget):
                 break
 
-    return jobs
+
+def fetch_jobicy(config, budget=None):
+    """Return every job from iter_jobicy() as a list."""
+    return list(iter_jobicy(config, budget))
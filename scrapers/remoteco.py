@@ -1,18 +1,38 @@
-import requests
-from bs4 import BeautifulSoup
-from utils import job_matches
-import time
+from budget import claim, spent
+from http_client import BROWSER_USER_AGENT, get_client
+from pagination import Pager
+from scrapers.html_backend import (
+    class_contains, first, page_text, parse_document, select_backend, text_of, xpath,
+)
+from utils import get_matcher
 
 
-def fetch_remoteco(config):
-    """Fetch jobs from remote.co using HTML scraping.
+# Precompiled card and field selectors for the lxml backend. Each mirrors
+# the bs4 lookup in _parse_remoteco_job (same tags, same class substrings).
+_X_CARDS = xpath(f'//a[{class_contains("job-item")}]')
+_X_CARDS_ALT = xpath(f'//div[{class_contains("job-card")}]')
+_X_TITLE = xpath("(.//h2 | .//h3 | .//strong)[1]")
+_X_COMPANY = xpath(f'(.//span[{class_contains("company", True)}])[1]')
+_X_COMPANY_ALT = xpath(f'(.//div[{class_contains("company", True)}])[1]')
+_X_URL = xpath("(self::a[@href] | .//a[@href])[1]/@href")  # the card itself is often the link
+_X_LOCATION = xpath(f'(.//span[{class_contains("location", True)}])[1]')
+_X_LOCATION_ALT = xpath(f'(.//div[{class_contains("location", True)}])[1]')
+_X_DATE = xpath(f'(.//span[{class_contains("date", True)}])[1]')
+_X_TAGS = xpath(f'.//span[{class_contains("badge")} or {class_contains("tag")}]')
+
+
+def iter_remoteco(config, budget=None):
+    """Yield jobs from remote.co using HTML scraping.
 
     remote.co is a job board with 100+ categories of remote jobs.
     No public API, but clean HTML structure and explicitly allows scraping in robots.txt.
+    Pages are parsed with lxml when available, else bs4 (see html_backend).
+    Each category is paged by a Pager (at most 10 pages by default, stopping
+    after 2 pages in a row without a match).
     """
     base_url = "https://remote.co"
     headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+        "User-Agent": BROWSER_USER_AGENT,
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
     }
     
@@ -24,48 +44,89 @@ def fetch_remoteco(config):
         "machine-learning-jobs",
     ]
     
-    jobs = []
+    client = get_client(config)
+    count = 0
     max_results = config.get("max_results_per_board") or 50
+    matcher = get_matcher(config)
+    if select_backend(config) == "lxml":
+        find_cards, parse_card = _find_cards_lxml, _parse_remoteco_job_lxml
+    else:
+        find_cards, parse_card = _find_cards_bs4, _parse_remoteco_job
     
     for category in categories:
-        if len(jobs) >= max_results:
+        if count >= max_results or spent(budget):
             break
         
         try:
             page = 1
-            while len(jobs) < max_results:
+            pager = Pager.for_board(config, "remoteco", category, max_pages=10, patience=2)
+            while count < max_results and not spent(budget) and pager.more():
                 url = f"{base_url}/remote-jobs/{category}?page={page}"
-                resp = requests.get(url, headers=headers, timeout=15)
+                resp = client.get(url, headers=headers, board="remoteco")
                 resp.raise_for_status()
                 
-                soup = BeautifulSoup(resp.content, "html.parser")
-                
-                # Look for job listings/cards
-                job_elements = soup.find_all("a", {"class": lambda x: x and "job-item" in x})
-                
-                if not job_elements:
-                    # Try alternate selector
-                    job_elements = soup.find_all("div", {"class": lambda x: x and "job-card" in x})
+                job_elements = find_cards(resp.content)
                 
                 if not job_elements:
                     break  # No more jobs on this page
                 
+                matched = 0
                 for elem in job_elements:
-                    if len(jobs) >= max_results:
+                    if count >= max_results or spent(budget):
                         break
                     
-                    job_data = _parse_remoteco_job(elem, base_url)
-                    if job_data and job_matches(job_data, config):
-                        jobs.append(job_data)
+                    job_data = parse_card(elem, base_url)
+                    if job_data and matcher.matches(job_data):
+                        if not claim(budget, job_data):
+                            return
+                        count += 1
+                        matched += 1
+                        yield job_data
                 
+                pager.record(len(job_elements), matched)
                 page += 1
-                time.sleep(2)  # Be respectful with rate limiting
+            pager.finish()
         
         except Exception as e:
             print(f"Error scraping {category}: {e}")
             continue
     
-    return jobs
+
+def fetch_remoteco(config, budget=None):
+    """Return every job from iter_remoteco() as a list."""
+    return list(iter_remoteco(config, budget))
+
+
+def fetch_detail(job, client, config):
+    """Return the description text from a remote.co job page.
+
+    Used by the enrichment stage (enrich.py) in place of the card text.
+    """
+    resp = client.get(job["url"], headers={"User-Agent": BROWSER_USER_AGENT}, board="remoteco")
+    resp.raise_for_status()
+    return page_text(resp.content, ("job_description", "job-description", "description"), select_backend(config))
+
+
+def _find_cards_bs4(content):
+    """Return the job cards on a page, parsing only the card subtrees."""
+    from bs4 import BeautifulSoup, SoupStrainer  # imported lazily: only HTML boards need it
+
+    only_cards = SoupStrainer(class_=lambda x: x and ("job-item" in x or "job-card" in x))
+    soup = BeautifulSoup(content, "html.parser", parse_only=only_cards)
+
+    # Look for job listings/cards
+    job_elements = soup.find_all("a", {"class": lambda x: x and "job-item" in x})
+    if not job_elements:
+        # Try alternate selector
+        job_elements = soup.find_all("div", {"class": lambda x: x and "job-card" in x})
+    return job_elements
+
+
+def _find_cards_lxml(content):
+    doc = parse_document(content)
+    if doc is None:
+        return []
+    return _X_CARDS(doc) or _X_CARDS_ALT(doc)
 
 
 def _parse_remoteco_job(element, base_url):
@@ -81,13 +142,9 @@ def _parse_remoteco_job(element, base_url):
             company_elem = element.find("div", {"class": lambda x: x and "company" in (x or "").lower()})
         company = company_elem.get_text(strip=True) if company_elem else ""
         
-        # Get URL
-        url = ""
-        url_elem = element.find("a", href=True)
-        if url_elem:
-            url = url_elem.get("href", "")
-            if url and not url.startswith("http"):
-                url = base_url + url
+        # Get URL: the usual card is itself the <a class="job-item" href=...>
+        url_elem = element if element.name == "a" and element.get("href") else element.find("a", href=True)
+        href = url_elem.get("href", "") if url_elem else ""
         
         # Get location
         location_elem = element.find("span", {"class": lambda x: x and "location" in (x or "").lower()})
@@ -95,10 +152,6 @@ def _parse_remoteco_job(element, base_url):
             location_elem = element.find("div", {"class": lambda x: x and "location" in (x or "").lower()})
         location = location_elem.get_text(strip=True) if location_elem else "Remote"
         
-        # Get salary (optional)
-        salary_elem = element.find("span", {"class": lambda x: x and "salary" in (x or "").lower()})
-        salary = salary_elem.get_text(strip=True) if salary_elem else ""
-        
         # Get date posted
         date_elem = element.find("span", {"class": lambda x: x and "date" in (x or "").lower()})
         date_posted = date_elem.get_text(strip=True) if date_elem else ""
@@ -113,21 +166,61 @@ def _parse_remoteco_job(element, base_url):
         # Get full text as fallback description
         description = element.get_text(separator=" ", strip=True)[:500]
         
-        job = {
-            "title": title.strip(),
-            "company": company.strip(),
-            "location": location,
-            "url": url,
-            "date_posted": date_posted,
-            "description": description,
-            "tags": tags,
-        }
-        
-        # Only return if we have essential fields
-        if job["title"] and job["company"]:
-            return job
+        return _build_job(title, company, href, location, date_posted, tags, description, base_url)
     
     except Exception:
         pass
     
     return None
+
+
+def _parse_remoteco_job_lxml(element, base_url):
+    """lxml counterpart of _parse_remoteco_job, returning the same dict."""
+    try:
+        company_elem = first(_X_COMPANY, element)
+        if company_elem is None:
+            company_elem = first(_X_COMPANY_ALT, element)
+        location_elem = first(_X_LOCATION, element)
+        if location_elem is None:
+            location_elem = first(_X_LOCATION_ALT, element)
+
+        tags = [t for t in (text_of(badge) for badge in _X_TAGS(element)) if t]
+
+        return _build_job(
+            text_of(first(_X_TITLE, element)),
+            text_of(company_elem),
+            first(_X_URL, element) or "",
+            text_of(location_elem) if location_elem is not None else "Remote",
+            text_of(first(_X_DATE, element)),
+            tags,
+            text_of(element, " ")[:500],
+            base_url,
+        )
+
+    except Exception:
+        pass
+
+    return None
+
+
+def _build_job(title, company, href, location, date_posted, tags, description, base_url):
+    url = href
+    if url and not url.startswith("http"):
+        url = base_url + url
+
+    job = {
+        "title": title.strip(),
+        "company": company.strip(),
+        "location": location,
+        "url": url,
+        "date_posted": date_posted,
+        "description": description,
+        "tags": tags,
+        "source": "remoteco",
+        "source_id": url,
+    }
+
+    # Only return if we have essential fields
+    if job["title"] and job["company"]:
+        return job
+    return None
@@ -1,11 +1,14 @@
-import requests
-import time
-from utils import job_matches
+from budget import claim, spent
+from http_client import get_client
+from utils import board_config, get_matcher
 
 
-# RemoteOK tag slugs that map to AI/ML roles. The API supports tag-based
-# endpoints like /api?tags=machine-learning,ai which pre-filter at source.
-_TAG_SEARCHES = [
+_FEED_URL = "https://remoteok.com/api"
+
+# RemoteOK tag slugs that map to AI/ML roles, unless boards.remoteok.tags in
+# config.json lists others. The API supports tag-based endpoints like
+# /api?tags=machine-learning which pre-filter at source.
+_DEFAULT_TAGS = [
     "machine-learning",
     "ai",
     "llm",
@@ -14,69 +17,117 @@ _TAG_SEARCHES = [
 ]
 
 
-def fetch_remoteok(config):
-    """Fetch jobs from RemoteOK API using tag-based endpoints.
+def iter_remoteok(config, budget=None):
+    """Yield jobs from the RemoteOK API, searched by tag.
 
-    RemoteOK supports /api?tags=<tag> to pre-filter by role category.
+    With boards.remoteok.mode = "tags" (the default) each tag is its own
+    /api?tags=<tag> request. Those results overlap heavily, so "feed" mode
+    fetches the whole feed once and answers every tag search from a local
+    tag index instead: one request per run (or per cache TTL) rather than
+    one per tag. Either way jobs come out tag by tag, in feed order.
     All RemoteOK jobs are remote and globally open unless stated otherwise.
     """
-    headers = {"User-Agent": "ai-job-scraper/1.0 (+https://github.com)"}
+    client = get_client(config)
+    settings = board_config(config, "remoteok")
+    tags = settings.get("tags") or _DEFAULT_TAGS
     max_results = config.get("max_results_per_board") or 100
+    matcher = get_matcher(config)
     seen_ids = set()
-    jobs = []
+    count = 0
+
+    if settings.get("mode") == "feed":
+        items = _search_feed(client, tags)
+    else:
+        items = _search_tags(client, tags)
+    try:
+        for item in items:
+            job_id = item.get("id")
+            if job_id in seen_ids:
+                continue
+            seen_ids.add(job_id)
 
-    for tag in _TAG_SEARCHES:
-        if len(jobs) >= max_results:
-            break
+            job = _parse_item(item)
+            if job["title"] and job["company"] and matcher.matches(job):
+                if not claim(budget, job):
+                    return
+                count += 1
+                yield job
+
+            if count >= max_results or spent(budget):
+                break  # before the next tag's request starts
+    finally:
+        items.close()
+
+
+def _search_tags(client, tags):
+    """Yield the listings of each tag search, one /api?tags= request per tag."""
+    for tag in tags:
+        # Decoded item by item as the feed downloads; closing this generator
+        # closes the response, so the rest of the feed is never read.
+        items = client.iter_json(f"{_FEED_URL}?tags={tag}", board="remoteok")
         try:
-            resp = requests.get(
-                f"https://remoteok.com/api?tags={tag}",
-                headers=headers,
-                timeout=15,
-            )
-            resp.raise_for_status()
-            data = resp.json()
+            for item in items:
+                if isinstance(item, dict) and item.get("id") is not None:
+                    yield item
         except Exception as e:
             print(f"  RemoteOK tag={tag!r} failed: {e}")
-            continue
+        finally:
+            items.close()
 
-        time.sleep(1)  # RemoteOK rate limits aggressively
 
-        for item in data:
-            if not isinstance(item, dict):
-                continue
-            if item.get("id") is None:
-                continue
+def _search_feed(client, tags):
+    """Yield the listings of each tag search, answered from one fetch of the feed."""
+    try:
+        index = build_tag_index(client.iter_json(_FEED_URL, board="remoteok"))
+    except Exception as e:
+        print(f"  RemoteOK feed failed: {e}")
+        return
+    for tag in tags:
+        yield from index.get(_tag_slug(tag), ())
+
+
+def build_tag_index(items):
+    """Map each tag slug to the feed listings carrying it, in feed order."""
+    index = {}
+    for item in items:
+        if not isinstance(item, dict) or item.get("id") is None:
+            continue  # the first element is RemoteOK's legal notice
+        for tag in item.get("tags") or ():
+            if isinstance(tag, str):
+                index.setdefault(_tag_slug(tag), []).append(item)
+    return index
+
+
+def _tag_slug(tag):
+    """"Machine Learning" and "machine-learning" are the same tag."""
+    return "-".join(tag.lower().split()).replace("_", "-")
+
+
+def _parse_item(item):
+    job_id = item.get("id")
+    title = item.get("position") or item.get("title") or ""
+    company = item.get("company") or ""
+    location = item.get("location") or item.get("location_text") or "Worldwide"
+    description = item.get("description") or ""
+    tags = item.get("tags") or []
+
+    url_field = item.get("url") or item.get("link") or ""
+    if url_field and url_field.startswith("/"):
+        url_field = "https://remoteok.com" + url_field
+
+    return {
+        "title": title.strip(),
+        "company": company.strip(),
+        "location": location.strip(),
+        "url": url_field,
+        "date_posted": item.get("date") or item.get("date_posted") or "",
+        "description": (description or "").strip()[:1000],
+        "tags": tags,
+        "source": "remoteok",
+        "source_id": str(job_id),
+    }
 
-            job_id = item.get("id")
-            if job_id in seen_ids:
-                continue
-            seen_ids.add(job_id)
 
-            title = item.get("position") or item.get("title") or ""
-            company = item.get("company") or ""
-            location = item.get("location") or item.get("location_text") or "Worldwide"
-            description = item.get("description") or ""
-            tags = item.get("tags") or []
-
-            url_field = item.get("url") or item.get("link") or ""
-            if url_field and url_field.startswith("/"):
-                url_field = "https://remoteok.com" + url_field
-
-            job = {
-                "title": title.strip(),
-                "company": company.strip(),
-                "location": location.strip(),
-                "url": url_field,
-                "date_posted": item.get("date") or item.get("date_posted") or "",
-                "description": (description or "").strip()[:1000],
-                "tags": tags,
-            }
-
-            if job["title"] and job["company"] and job_matches(job, config):
-                jobs.append(job)
-
-            if len(jobs) >= max_results:
-                break
-
-    return jobs
+def fetch_remoteok(config, budget=None):
+    """Return every job from iter_remoteok() as a list."""
+    return list(iter_remoteok(config, budget))
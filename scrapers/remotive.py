@@ -1,9 +1,10 @@
-import requests
-from utils import job_matches
+from budget import claim, spent
+from http_client import get_client
+from utils import get_matcher
 
 
-def fetch_remotive(config):
-    """Fetch jobs from Remotive API and return a list of job dicts.
+def iter_remotive(config, budget=None):
+    """Yield matching job dicts from the Remotive API.
 
     Remotive provides a free API for remote jobs with fields like:
     title, company_name, url, location, description, tags (category, sub_category)
@@ -17,50 +18,59 @@ def fetch_remotive(config):
         "search": "AI OR machine learning OR LLM OR GenAI",
         "category": "software-dev",  # narrows to tech roles
     }
-    headers = {"User-Agent": "ai-job-scraper/1.0 (+https://github.com)"}
 
-    try:
-        resp = requests.get(url, params=params, headers=headers, timeout=15)
-        resp.raise_for_status()
-        data = resp.json()
-    except Exception:
-        return []
-
-    jobs = []
+    count = 0
     max_results = config.get("max_results_per_board") or 50
+    matcher = get_matcher(config)
 
-    for item in data.get("jobs", []):
-        if not isinstance(item, dict):
-            continue
+    # {"job-count": N, "jobs": [...]}: jobs are decoded one at a time as the
+    # body downloads, and reading stops once max_results have matched.
+    items = get_client(config).iter_json(url, params=params, board="remotive", path="jobs")
+    try:
+        for item in items:
+            if not isinstance(item, dict):
+                continue
 
-        title = item.get("title") or ""
-        company = item.get("company_name") or ""
-        location = item.get("location") or ""
-        description = item.get("description") or ""
+            title = item.get("title") or ""
+            company = item.get("company_name") or ""
+            location = item.get("location") or ""
+            description = item.get("description") or ""
         
-        # Remotive has category/sub_category; add them as pseudo-tags
-        tags = []
-        if item.get("category"):
-            tags.append(item.get("category"))
-        if item.get("sub_category"):
-            tags.append(item.get("sub_category"))
+            # Remotive has category/sub_category; add them as pseudo-tags
+            tags = []
+            if item.get("category"):
+                tags.append(item.get("category"))
+            if item.get("sub_category"):
+                tags.append(item.get("sub_category"))
+
+            url_field = item.get("url") or ""
 
-        url_field = item.get("url") or ""
+            job = {
+                "title": title.strip(),
+                "company": company.strip(),
+                "location": location.strip(),
+                "url": url_field,
+                "date_posted": item.get("published_at") or item.get("created_at") or "",
+                "description": (description or "").strip(),
+                "tags": tags,
+                "source": "remotive",
+                "source_id": str(item.get("id") or url_field),
+            }
 
-        job = {
-            "title": title.strip(),
-            "company": company.strip(),
-            "location": location.strip(),
-            "url": url_field,
-            "date_posted": item.get("published_at") or item.get("created_at") or "",
-            "description": (description or "").strip(),
-            "tags": tags,
-        }
+            if matcher.matches(job):
+                if not claim(budget, job):
+                    return
+                count += 1
+                yield job
 
-        if job_matches(job, config):
-            jobs.append(job)
+            if count >= max_results or spent(budget):
+                break
+    except Exception:
+        return
+    finally:
+        items.close()
 
-        if len(jobs) >= max_results:
-            break
 
-    return jobs
+def fetch_remotive(config, budget=None):
+    """Return every job from iter_remotive() as a list."""
+    return list(iter_remotive(config, budget))
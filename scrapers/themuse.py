@@ -1,5 +1,8 @@
-import requests
-from utils import job_matches
+from budget import claim, spent
+from http_client import get_client
+from location import classify_location
+from pagination import Pager
+from utils import get_matcher
 
 
 # The Muse categories most relevant to AI/ML roles
@@ -15,35 +18,39 @@ _LEVELS = [
 ]
 
 
-def fetch_themuse(config):
-    """Fetch jobs from The Muse public API.
+def iter_themuse(config, budget=None):
+    """Yield jobs from The Muse public API.
 
     The Muse has a free public API that supports category and level filtering.
     No API key required for basic access.
     Docs: https://www.themuse.com/developers/api/v2
+
+    Each category x level combo is paged by its own Pager, so a combo stops
+    as soon as a page yields no matching job.
     """
     base_url = "https://www.themuse.com/api/public/jobs"
-    headers = {"User-Agent": "ai-job-scraper/1.0 (+https://github.com)"}
+    client = get_client(config)
     max_results = config.get("max_results_per_board") or 50
+    matcher = get_matcher(config)
 
     seen_ids = set()
-    jobs = []
+    count = 0
 
     for category in _CATEGORIES:
-        if len(jobs) >= max_results:
+        if count >= max_results or spent(budget):
             break
         for level in _LEVELS:
-            if len(jobs) >= max_results:
+            if count >= max_results or spent(budget):
                 break
 
             page = 0
-            while len(jobs) < max_results and page < 3:  # cap at 3 pages per combo
+            pager = Pager.for_board(config, "themuse", f"{category}|{level}", max_pages=3, patience=1)
+            while count < max_results and not spent(budget) and pager.more():
                 try:
-                    resp = requests.get(
+                    resp = client.get(
                         base_url,
                         params={"category": category, "level": level, "page": page},
-                        headers=headers,
-                        timeout=15,
+                        board="themuse",
                     )
                     resp.raise_for_status()
                     data = resp.json()
@@ -55,6 +62,7 @@ def fetch_themuse(config):
                 if not results:
                     break
 
+                matched = 0
                 for item in results:
                     if not isinstance(item, dict):
                         continue
@@ -78,8 +86,7 @@ def fetch_themuse(config):
                     # The job title filter is the primary quality signal.
                     is_remote = (
                         not location_names
-                        or any("remote" in ln.lower() or "flexible" in ln.lower()
-                               for ln in location_names)
+                        or any(classify_location(ln).remote for ln in location_names)
                     )
                     if not is_remote:
                         continue
@@ -99,17 +106,29 @@ def fetch_themuse(config):
                         "date_posted": date_posted,
                         "description": description.strip()[:1000],
                         "tags": tags,
+                        "source": "themuse",
+                        "source_id": str(job_id or url),
                     }
 
-                    if job["title"] and job["company"] and job_matches(job, config):
-                        jobs.append(job)
+                    if job["title"] and job["company"] and matcher.matches(job):
+                        if not claim(budget, job):
+                            return
+                        count += 1
+                        matched += 1
+                        yield job
 
-                    if len(jobs) >= max_results:
+                    if count >= max_results or spent(budget):
                         break
 
+                pager.record(len(results), matched)
+
                 # Move to next page if there is one
                 if page >= data.get("page_count", 1) - 1:
                     break
                 page += 1
+            pager.finish()
+
 
-    return jobs
+def fetch_themuse(config, budget=None):
+    """Return every job from iter_themuse() as a list."""
+    return list(iter_themuse(config, budget))
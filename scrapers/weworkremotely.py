@@ -1,14 +1,29 @@
-import requests
-from bs4 import BeautifulSoup
-from utils import job_matches
-import time
+from budget import claim, spent
+from http_client import BROWSER_USER_AGENT, get_client
+from scrapers.html_backend import (
+    class_contains, first, page_text, parse_document, select_backend, text_of, xpath,
+)
+from utils import get_matcher
 
 
-def fetch_weworkremotely(config):
-    """Fetch jobs from We Work Remotely by HTML scraping.
+# Precompiled listing and field selectors for the lxml backend. Each mirrors
+# the bs4 lookup in _parse_job_listing (same tags, same class substrings).
+_X_LISTINGS = xpath(f'//a[{class_contains("job-card")}]')
+_X_LISTINGS_ALT = xpath('//a[contains(@href, "/remote-jobs/")]')
+_X_TITLE = xpath("(.//h2 | .//strong | .//a)[1]")
+_X_COMPANY = xpath(f'(.//span[{class_contains("company", True)}])[1]')
+_X_STRONG = xpath("(.//strong)[1]")
+_X_DATE = xpath(f'(.//span[{class_contains("date", True)}])[1]')
+_X_TAGS = xpath(f'.//span[{class_contains("badge", True)}]')
+_X_LOCATION = xpath(f'(.//span[{class_contains("location", True)}])[1]')
+
+
+def iter_weworkremotely(config, budget=None):
+    """Yield jobs from We Work Remotely by HTML scraping.
 
     We Work Remotely doesn't have a public API for browsing jobs, so we scrape
     their category/search pages and extract job listings from the HTML.
+    Pages are parsed with lxml when available, else bs4 (see html_backend).
     """
     base_url = "https://weworkremotely.com"
     
@@ -20,53 +35,88 @@ def fetch_weworkremotely(config):
     ]
     
     headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+        "User-Agent": BROWSER_USER_AGENT,
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
         "Accept-Language": "en-US,en;q=0.5",
-        "Accept-Encoding": "gzip, deflate",
-        "Connection": "keep-alive",
         "Upgrade-Insecure-Requests": "1",
         "Referer": "https://weworkremotely.com/",
     }
     
-    jobs = []
+    client = get_client(config)
+    count = 0
     max_results = config.get("max_results_per_board") or 50
+    matcher = get_matcher(config)
+    if select_backend(config) == "lxml":
+        find_listings, parse_listing = _find_listings_lxml, _parse_job_listing_lxml
+    else:
+        find_listings, parse_listing = _find_listings_bs4, _parse_job_listing
     
     for category in categories:
-        if len(jobs) >= max_results:
+        if count >= max_results or spent(budget):
             break
             
         try:
             url = f"{base_url}/categories/{category}"
-            resp = requests.get(url, headers=headers, timeout=15)
+            resp = client.get(url, headers=headers, board="weworkremotely")
             resp.raise_for_status()
             
-            soup = BeautifulSoup(resp.content, "html.parser")
-            
-            # Find job listing containers - typically <a> tags with specific classes
-            # Job listings are in article/section containers with job data
-            job_listings = soup.find_all("a", {"class": lambda x: x and "job-card" in x})
-            
-            if not job_listings:
-                # Try alternate selector if the first one fails
-                job_listings = soup.find_all("a", href=lambda x: x and "/remote-jobs/" in x)
+            job_listings = find_listings(resp.content)
             
             for listing in job_listings:
-                if len(jobs) >= max_results:
+                if count >= max_results or spent(budget):
                     break
                 
-                job_data = _parse_job_listing(listing, base_url)
-                if job_data and job_matches(job_data, config):
-                    jobs.append(job_data)
-            
-            # Be respectful with rate limiting
-            time.sleep(2)
+                job_data = parse_listing(listing, base_url)
+                if job_data and matcher.matches(job_data):
+                    if not claim(budget, job_data):
+                        return
+                    count += 1
+                    yield job_data
             
         except Exception as e:
             print(f"Error scraping {category}: {e}")
             continue
     
-    return jobs
+
+def fetch_weworkremotely(config, budget=None):
+    """Return every job from iter_weworkremotely() as a list."""
+    return list(iter_weworkremotely(config, budget))
+
+
+def fetch_detail(job, client, config):
+    """Return the description text from a We Work Remotely job page.
+
+    Used by the enrichment stage (enrich.py) in place of the card text.
+    """
+    resp = client.get(job["url"], headers={"User-Agent": BROWSER_USER_AGENT}, board="weworkremotely")
+    resp.raise_for_status()
+    return page_text(
+        resp.content,
+        ("lis-container__job__content__description", "listing-container", "description"),
+        select_backend(config),
+    )
+
+
+def _find_listings_bs4(content):
+    """Return the job listings on a page, parsing only <a> subtrees."""
+    from bs4 import BeautifulSoup, SoupStrainer  # imported lazily: only HTML boards need it
+
+    soup = BeautifulSoup(content, "html.parser", parse_only=SoupStrainer("a"))
+
+    # Find job listing containers - typically <a> tags with specific classes
+    # Job listings are in article/section containers with job data
+    job_listings = soup.find_all("a", {"class": lambda x: x and "job-card" in x})
+    if not job_listings:
+        # Try alternate selector if the first one fails
+        job_listings = soup.find_all("a", href=lambda x: x and "/remote-jobs/" in x)
+    return job_listings
+
+
+def _find_listings_lxml(content):
+    doc = parse_document(content)
+    if doc is None:
+        return []
+    return _X_LISTINGS(doc) or _X_LISTINGS_ALT(doc)
 
 
 def _parse_job_listing(element, base_url):
@@ -74,8 +124,6 @@ def _parse_job_listing(element, base_url):
     try:
         # Extract URL
         url = element.get("href", "")
-        if not url.startswith("http"):
-            url = base_url + url
         
         # Extract title (usually in h2 or strong tag)
         title_elem = element.find(["h2", "strong", "a"])
@@ -105,22 +153,58 @@ def _parse_job_listing(element, base_url):
         # Get all text as description fallback
         description = element.get_text(separator=" ", strip=True)[:500]
         
-        job = {
-            "title": title.strip(),
-            "company": company.strip(),
-            "location": location.strip() or "Remote",
-            "url": url,
-            "date_posted": date_posted,
-            "description": description,
-            "tags": tags,
-        }
-        
-        # Only return if we have essential fields
-        if job["title"] and job["company"]:
-            return job
+        return _build_job(url, title, company, date_posted, tags, location, description, base_url)
         
     except Exception:
         pass
     
     return None
 
+
+def _parse_job_listing_lxml(element, base_url):
+    """lxml counterpart of _parse_job_listing, returning the same dict."""
+    try:
+        company_elem = first(_X_COMPANY, element)
+        if company_elem is None:
+            company_elem = first(_X_STRONG, element)
+        location_elem = first(_X_LOCATION, element)
+
+        tags = [t for t in (text_of(badge) for badge in _X_TAGS(element)) if t]
+
+        return _build_job(
+            element.get("href", ""),
+            text_of(first(_X_TITLE, element)),
+            text_of(company_elem),
+            text_of(first(_X_DATE, element)),
+            tags,
+            text_of(location_elem) if location_elem is not None else "Remote",
+            text_of(element, " ")[:500],
+            base_url,
+        )
+
+    except Exception:
+        pass
+
+    return None
+
+
+def _build_job(url, title, company, date_posted, tags, location, description, base_url):
+    if not url.startswith("http"):
+        url = base_url + url
+
+    job = {
+        "title": title.strip(),
+        "company": company.strip(),
+        "location": location.strip() or "Remote",
+        "url": url,
+        "date_posted": date_posted,
+        "description": description,
+        "tags": tags,
+        "source": "weworkremotely",
+        "source_id": url,
+    }
+
+    # Only return if we have essential fields
+    if job["title"] and job["company"]:
+        return job
+    return None
@@ -0,0 +1,177 @@
+import json
+import os
+import sqlite3
+import time
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    source TEXT NOT NULL,
+    source_id TEXT NOT NULL,
+    title TEXT,
+    company TEXT,
+    location TEXT,
+    url TEXT,
+    date_posted TEXT,
+    description TEXT,
+    tags TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    first_run INTEGER NOT NULL,
+    last_run INTEGER NOT NULL,
+    PRIMARY KEY (source, source_id)
+);
+CREATE INDEX IF NOT EXISTS jobs_first_run ON jobs (first_run);
+CREATE INDEX IF NOT EXISTS jobs_last_seen ON jobs (last_seen);
+"""
+
+_UPSERT = """
+INSERT INTO jobs (
+    source, source_id, title, company, location, url, date_posted,
+    description, tags, first_seen, last_seen, first_run, last_run
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (source, source_id) DO UPDATE SET
+    title = excluded.title,
+    company = excluded.company,
+    location = excluded.location,
+    url = excluded.url,
+    date_posted = excluded.date_posted,
+    description = excluded.description,
+    tags = excluded.tags,
+    last_seen = excluded.last_seen,
+    last_run = excluded.last_run
+"""
+
+_JOB_COLUMNS = ("title", "company", "location", "url", "date_posted", "description", "tags", "source", "source_id")
+
+
+def job_identity(job):
+    """Return the (source, source_id) pair that identifies a posting on its board.
+
+    Scrapers set source_id to the board's own id (RemoteOK id, Greenhouse
+    board/id, Arbeitnow slug, URL for the HTML boards); the URL and then
+    company+title are fallbacks for jobs without one.
+    """
+    source = job.get("source") or "unknown"
+    source_id = job.get("source_id") or job.get("url")
+    if not source_id:
+        source_id = f"{job.get('company', '').lower()}|{job.get('title', '').lower()}"
+    return source, str(source_id)
+
+
+class JobStore:
+    """Persistent SQLite store of every job seen across runs.
+
+    Jobs are upserted on their per-board identity, recording the run and
+    time they were first and last seen, so "what's new since the last run"
+    is an indexed lookup on first_run instead of a diff over old CSVs.
+    """
+
+    def __init__(self, path):
+        dirname = os.path.dirname(path)
+        if dirname:
+            os.makedirs(dirname, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(_SCHEMA)
+
+    @classmethod
+    def from_config(cls, config):
+        """Open the store from config["store"], or return None if disabled."""
+        settings = (config or {}).get("store") or {}
+        if not settings.get("enabled"):
+            return None
+        return cls(settings.get("path") or os.path.join("outputs", "jobs.db"))
+
+    def start_run(self):
+        """Record a new run and return its id."""
+        with self.conn:
+            cur = self.conn.execute(
+                "INSERT INTO runs (started_at) VALUES (?)",
+                (time.strftime("%Y-%m-%d %H:%M:%S"),),
+            )
+        return cur.lastrowid
+
+    def _row(self, job, run_id, now):
+        source, source_id = job_identity(job)
+        return (
+            source,
+            source_id,
+            job.get("title", ""),
+            job.get("company", ""),
+            job.get("location", ""),
+            job.get("url", ""),
+            str(job.get("date_posted") or ""),
+            job.get("description", ""),
+            json.dumps(job.get("tags") or []),
+            now,
+            now,
+            run_id,
+            run_id,
+        )
+
+    def upsert(self, jobs, run_id):
+        """Insert or refresh jobs for this run. Returns how many were new."""
+        now = time.strftime("%Y-%m-%d %H:%M:%S")
+        rows = [self._row(job, run_id, now) for job in jobs]
+        with self.conn:
+            before = self.conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE first_run = ?", (run_id,)
+            ).fetchone()[0]
+            self.conn.executemany(_UPSERT, rows)
+            after = self.conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE first_run = ?", (run_id,)
+            ).fetchone()[0]
+        return after - before
+
+    def record(self, jobs, run_id, new_only=False, batch_size=100):
+        """Upsert jobs as they stream past and yield them on.
+
+        With new_only, only jobs first seen in this run are passed through.
+        Writes are committed every batch_size jobs rather than per job.
+        """
+        pending = 0
+        try:
+            for job in jobs:
+                row = self._row(job, run_id, time.strftime("%Y-%m-%d %H:%M:%S"))
+                first_run = self.conn.execute(
+                    "SELECT first_run FROM jobs WHERE source = ? AND source_id = ?", row[:2]
+                ).fetchone()
+                self.conn.execute(_UPSERT, row)
+                pending += 1
+                if pending >= batch_size:
+                    self.conn.commit()
+                    pending = 0
+                if not new_only or first_run is None or first_run[0] == run_id:
+                    yield job
+        finally:
+            self.conn.commit()
+
+    def new_jobs(self, run_id):
+        """Return the jobs first seen in the given run, as job dicts."""
+        rows = self.conn.execute(
+            f"SELECT {', '.join(_JOB_COLUMNS)} FROM jobs WHERE first_run = ? ORDER BY rowid",
+            (run_id,),
+        )
+        return [self._job(row) for row in rows]
+
+    def recent_jobs(self, days):
+        """Return jobs last seen within the past `days` days, oldest first."""
+        cutoff = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(time.time() - days * 86400))
+        rows = self.conn.execute(
+            f"SELECT {', '.join(_JOB_COLUMNS)} FROM jobs WHERE last_seen >= ? ORDER BY rowid",
+            (cutoff,),
+        )
+        return [self._job(row) for row in rows]
+
+    def _job(self, row):
+        job = dict(row)
+        job["tags"] = json.loads(job["tags"] or "[]")
+        return job
+
+    def close(self):
+        self.conn.close()
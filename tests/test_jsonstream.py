@@ -0,0 +1,103 @@
+import json
+import random
+
+import pytest
+
+from jsonstream import iter_array
+
+
+def _chunked(data, sizes):
+    """Split data into chunks of the given sizes (the last takes the rest)."""
+    chunks, pos = [], 0
+    for size in sizes:
+        chunks.append(data[pos:pos + size])
+        pos += size
+    chunks.append(data[pos:])
+    return chunks
+
+
+def _every_split(data):
+    """data cut in two at every byte position."""
+    for i in range(len(data) + 1):
+        yield [data[:i], data[i:]]
+
+
+_VALUES = [
+    12, -3.5, 1e-7, 0, 1234567890123,
+    True, False, None,
+    "plain", 'quote " and backslash \\', "tab\tnew\nline", "unicode é中\U0001f600",
+    {"title": "ML Engineer", "tags": ["python", "llm"], "salary": None},
+    [], {}, [[1, 2], {"a": [3]}],
+]
+
+
+def test_values_split_at_every_boundary():
+    data = json.dumps(_VALUES).encode("utf-8")
+    for chunks in _every_split(data):
+        assert list(iter_array(chunks)) == _VALUES
+
+
+def test_non_ascii_split_mid_character():
+    data = json.dumps(["Zürich", "東京", "🚀 launch"], ensure_ascii=False).encode("utf-8")
+    for chunks in _every_split(data):
+        assert list(iter_array(chunks)) == ["Zürich", "東京", "🚀 launch"]
+
+
+def test_escaped_strings_split_mid_escape():
+    values = ["a\\b", "é", 'say "hi"', "\\u0041"]
+    data = json.dumps(values).encode("utf-8")  # ensure_ascii: é stays an escape
+    for chunks in _every_split(data):
+        assert list(iter_array(chunks)) == values
+
+
+def test_random_chunk_sizes():
+    rng = random.Random(0)
+    data = json.dumps(_VALUES * 20, ensure_ascii=False).encode("utf-8")
+    for _ in range(200):
+        sizes = [rng.randint(1, 16) for _ in range(len(data) // 4)]
+        assert list(iter_array(_chunked(data, sizes))) == _VALUES * 20
+
+
+def test_numbers_are_not_cut_at_a_chunk_boundary():
+    assert list(iter_array([b"[1", b"2.", b"5e", b"1, 3", b"]"])) == [125.0, 3]
+
+
+def test_literals_split_across_chunks():
+    assert list(iter_array([b"[tr", b"ue, n", b"ull, fa", b"lse]"])) == [True, None, False]
+
+
+def test_path_seeks_the_key():
+    doc = {"meta": {"jobs": "not this one", "n": [1, 2]}, "count": 2, "jobs": [{"id": 1}, {"id": 2}], "after": 1}
+    data = json.dumps(doc).encode("utf-8")
+    for chunks in _every_split(data):
+        assert list(iter_array(chunks, path="jobs")) == [{"id": 1}, {"id": 2}]
+
+
+def test_path_missing_yields_nothing():
+    assert list(iter_array([b'{"count": 0, "items": [1]}'], path="jobs")) == []
+    assert list(iter_array([b"{}"], path="jobs")) == []
+
+
+def test_empty_array_and_byte_order_mark():
+    assert list(iter_array([b"  [ ]  "])) == []
+    assert list(iter_array([b"\xef\xbb", b"\xbf[1]"])) == [1]
+
+
+def test_stops_reading_when_the_caller_stops():
+    read = []
+
+    def chunks():
+        for chunk in (b"[1,", b"2,", b"3,", b"4]"):
+            read.append(chunk)
+            yield chunk
+
+    items = iter_array(chunks())
+    assert next(items) == 1
+    items.close()
+    assert len(read) < 4
+
+
+@pytest.mark.parametrize("data", [b'{"a": 1}', b"[1, 2", b"[1 2]", b'["abc', b"[\xff]"])
+def test_malformed_input_raises(data):
+    with pytest.raises(ValueError):
+        list(iter_array([data]))
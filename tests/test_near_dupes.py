@@ -0,0 +1,77 @@
+from near_dupes import NearDuplicateIndex, merge_near_duplicates
+
+
+_BOILERPLATE = (
+    "Acme builds developer tools used by thousands of teams worldwide. We are a remote-first "
+    "company with competitive salary, equity, health insurance, a learning budget and flexible "
+    "hours. We value ownership, curiosity and kindness, and we hire across time zones. "
+)
+
+
+def _job(title, source="himalayas", source_id="1", description=None, company="Acme"):
+    return {
+        "title": title,
+        "company": company,
+        "description": _BOILERPLATE + (description or f"In this role you will work on {title}."),
+        "source": source,
+        "source_id": source_id,
+    }
+
+
+def test_different_titles_sharing_company_boilerplate_are_kept():
+    jobs = [
+        _job("Senior Machine Learning Engineer", "himalayas", "1"),
+        _job("Staff Data Scientist, Growth", "himalayas", "2"),
+    ]
+    assert len(merge_near_duplicates(jobs)) == 2
+
+    index = NearDuplicateIndex()
+    assert index.add(jobs[0])[1] is True
+    assert index.add(jobs[1])[1] is True
+
+
+def test_different_titles_from_different_boards_are_kept():
+    jobs = [
+        _job("Senior Machine Learning Engineer", "himalayas", "1"),
+        _job("Staff Data Scientist, Growth", "remoteok", "2"),
+    ]
+    assert len(merge_near_duplicates(jobs)) == 2
+
+
+def test_same_source_with_different_ids_never_merges():
+    jobs = [
+        _job("Senior Machine Learning Engineer", "himalayas", "1"),
+        _job("Senior Machine Learning Engineer", "himalayas", "2"),
+    ]
+    assert len(merge_near_duplicates(jobs)) == 2
+
+
+def test_cross_board_copy_is_merged():
+    jobs = [
+        _job("Senior Machine Learning Engineer", "greenhouse", "gh-1"),
+        _job("Sr. ML Engineer (Remote)", "remoteok", "ro-9",
+             description="In this role you will work on Senior Machine Learning Engineer."),
+    ]
+    merged = merge_near_duplicates(jobs)
+    assert len(merged) == 1
+    assert merged[0]["sources"] == ["greenhouse", "remoteok"]
+
+
+def test_lsh_only_compares_similar_titles(monkeypatch):
+    import random
+
+    import near_dupes
+
+    calls = []
+    jaccard = near_dupes.jaccard
+    monkeypatch.setattr(near_dupes, "jaccard", lambda a, b: calls.append(1) or jaccard(a, b))
+
+    words = [f"word{i}" for i in range(300)]
+    rng = random.Random(0)
+    index = NearDuplicateIndex()
+    n = 1000
+    for i in range(n):
+        title = f"Senior {' '.join(rng.sample(words, 3))} Engineer"
+        index.add({"title": title, "company": "Acme", "source": "himalayas", "source_id": str(i)})
+    # One company, all distinct titles: comparing every pair would be n * (n - 1) / 2.
+    assert len(calls) < 0.05 * n * (n - 1) / 2
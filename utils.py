@@ -1,4 +1,5 @@
 import re
+import threading
 
 
 def _text(s):
@@ -15,6 +16,102 @@ def text_contains_any(text, keywords):
     return False
 
 
+# Config keys that hold keyword rule groups, in the order they are applied.
+_RULE_GROUPS = ("exclude_keywords", "location_keywords", "job_keywords", "role_keywords")
+
+_matchers = {}
+_matchers_lock = threading.Lock()
+
+
+def _compile_keywords(keywords):
+    """Compile keywords into a single whole-word alternation regex.
+
+    Searching `\b(?:a|b|c)\b` finds a match exactly when one of the separate
+    `\ba\b`, `\bb\b`, `\bc\b` patterns would, but scans the text once.
+    Returns None when there are no usable keywords.
+    """
+    words = []
+    for k in keywords:
+        if k and k.lower() not in words:
+            words.append(k.lower())
+    if not words:
+        return None
+    return re.compile(r"\b(?:" + "|".join(re.escape(w) for w in words) + r")\b")
+
+
+class JobMatcher:
+    """The config filters compiled once and reused for every job.
+
+    Build it with get_matcher(config); see job_matches() for the rules.
+    """
+
+    def __init__(self, config):
+        self.exclude = _compile_keywords(config.get("exclude_keywords", []) or [])
+
+        loc_keywords = [k.lower() for k in (config.get("location_keywords") or [])]
+        self.check_location = "anywhere" not in loc_keywords
+        self.location = _compile_keywords(loc_keywords)
+        # location string -> whether it alone contains a location keyword.
+        # Boards reuse a handful of strings ("Remote", "Worldwide"), so most
+        # jobs pass the location check without scanning their description.
+        self._location_hits = {}
+
+        self.job = _compile_keywords(config.get("job_keywords") or [])
+        self.role = _compile_keywords(config.get("role_keywords") or [])
+
+    def matches(self, job):
+        title = job.get("title", "").lower()
+        description = job.get("description", "").lower()
+
+        # 1. Exclusions — title + description only (not tags, which can be noisy)
+        if self.exclude and self.exclude.search(title + " " + description):
+            return False
+
+        # 2. Location check — skipped if "anywhere" is in location_keywords
+        if self.check_location:
+            if not self.location:
+                return False
+            location = job.get("location", "").lower()
+            if not self._location_matches(location):
+                tags_text = " ".join(job.get("tags") or []).lower()
+                combined = f"{title} {job.get('company', '').lower()} {description} {tags_text} {location}"
+                if not self.location.search(combined):
+                    return False
+
+        # 3. Job keyword must appear in the title
+        if not self.job or not self.job.search(title):
+            return False
+
+        # 4. Role keyword must appear in the title
+        if not self.role or not self.role.search(title):
+            return False
+
+        return True
+
+    def _location_matches(self, location):
+        hit = self._location_hits.get(location)
+        if hit is None:
+            hit = self._location_hits[location] = bool(location and self.location.search(location))
+        return hit
+
+
+def get_matcher(config):
+    """Return the shared JobMatcher for this config's keyword lists.
+
+    Matchers are cached by the keyword lists themselves, so every scraper (and
+    every thread) filtering with the same config reuses one compiled instance.
+    """
+    key = tuple(tuple(config.get(group) or ()) for group in _RULE_GROUPS)
+    matcher = _matchers.get(key)
+    if matcher is None:
+        with _matchers_lock:
+            matcher = _matchers.get(key)
+            if matcher is None:
+                matcher = JobMatcher(config)
+                _matchers[key] = matcher
+    return matcher
+
+
 def job_matches(job, config):
     """Return True if the job fits the config filters.
 
@@ -23,53 +120,23 @@ def job_matches(job, config):
     2. A location keyword must appear in the combined text unless "anywhere"
        is in location_keywords (all boards here are remote-only so this is
        mostly a safety net).
-    3. At least one job_keyword must match as a whole word in the title+tags
-       (the primary signal). If not found there, it must appear in the
-       description AND at least one role_keyword must also appear in the
-       title — preventing jobs that merely mention AI in passing.
+    3. At least one job_keyword must match as a whole word in the title.
+       Tags are unreliable (Himalayas tags "AI" on generic roles) and
+       descriptions are noisy HTML blobs, so the title is the only
+       trustworthy signal.
     4. At least one role_keyword must match as a whole word in the title.
        This ensures we only surface roles the user actually wants.
 
     Matching uses word-boundary regex to avoid substring false positives
-    (e.g. "AI" won't match inside "MAIL" or "PAID").
+    (e.g. "AI" won't match inside "MAIL" or "PAID"). The patterns are
+    compiled once per config by get_matcher(); scrapers filtering many jobs
+    should hold on to that matcher rather than calling this per job.
     """
-    title = job.get("title", "").lower()
-    description = job.get("description", "").lower()
-    tags_text = " ".join(job.get("tags") or []).lower()
-    location = job.get("location", "").lower()
+    return get_matcher(config).matches(job)
 
-    # Combined for exclusion / location checks
-    combined = f"{title} {job.get('company', '').lower()} {description} {tags_text} {location}"
-
-    def _contains_word(text, kw):
-        if not kw:
-            return False
-        pattern = r"\b" + re.escape(kw.lower()) + r"\b"
-        return re.search(pattern, text) is not None
-
-    # 1. Exclusions — check title + description only (not tags, which can be noisy)
-    for ex in config.get("exclude_keywords", []) or []:
-        if _contains_word(title + " " + description, ex):
-            return False
-
-    # 2. Location check — skipped if "anywhere" is in location_keywords (default).
-    # All boards we use are already remote-only, so this is rarely needed.
-    loc_keywords = [k.lower() for k in (config.get("location_keywords") or [])]
-    if "anywhere" not in loc_keywords:
-        if not any(_contains_word(combined, lk) for lk in loc_keywords):
-            return False
-
-    job_keys = config.get("job_keywords") or []
-    role_keys = config.get("role_keywords") or []
-
-    # 3. Job keyword must appear in the title only.
-    # Tags are unreliable (Himalayas tags "AI" on generic roles) and descriptions
-    # are noisy HTML blobs. Title is the only trustworthy signal.
-    if not any(_contains_word(title, jk) for jk in job_keys):
-        return False
-
-    # 4. Role keyword must appear in the title
-    if not any(_contains_word(title, rk) for rk in role_keys):
-        return False
 
-    return True
+def board_config(config, board):
+    """Return the per-board settings from config["boards"][board] (or {})."""
+    if not board:
+        return {}
+    return (config.get("boards") or {}).get(board) or {}